@@ -13,7 +13,10 @@ Key outputs:
 - Linear and non-linear regression models
 """
 
+import math
+import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 import pandas as pd
@@ -23,6 +26,12 @@ from matplotlib.patches import Patch
 from scipy import stats
 from scipy.optimize import curve_fit
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 warnings.filterwarnings('ignore')
 
 # ----------------- Configuration -----------------
@@ -32,19 +41,48 @@ YEARS = [2014, 2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022]
 WARM_YEARS = [2017, 2018, 2022]    # Egg temperature > 75th percentile
 COLD_YEARS = [2014, 2015, 2020]    # Egg temperature < 25th percentile
 NEUTRAL_YEARS = [2016, 2019, 2021] # Between 25th-75th percentile
+WARM_SET = frozenset(WARM_YEARS)
+COLD_SET = frozenset(COLD_YEARS)
+YEAR_TYPES = ["warm", "cold", "neutral"]
+YEAR_TYPE_DTYPE = pd.CategoricalDtype(YEAR_TYPES)  # Fixed so concat keeps codes
 
 # MPA zones
 MPA_ORDER = ["MNR-7", "MNR-8-N", "MNR-8-S", "SMPA-2", "SMPA-4"]
 
+# Per-particle summary columns used here (all others are skipped on read)
+PARTICLE_USECOLS = ["zone_release", "release_lon", "release_lat",
+                    "settle_lon", "settle_lat", "temp_mean_egg", "temp_mean",
+                    "distance_km"]
+PARTICLE_DTYPES = {
+    "zone_release": pd.CategoricalDtype(MPA_ORDER),  # Non-MPA zones -> NaN
+    "release_lon": "float32",
+    "release_lat": "float32",
+    "settle_lon": "float32",
+    "settle_lat": "float32",
+    "temp_mean_egg": "float32",
+    "temp_mean": "float32",
+}
+
 # Colors consistent with other analyses
 COLOR_COLD = "#3B4CC0"   # Blue
 COLOR_WARM = "#B40426"   # Red
 COLOR_NEUTRAL = "#888888" # Gray
 
+EARTH_RADIUS_KM = 6371.0
+
 # Statistical parameters
 N_BOOTSTRAP = 2000
 ALPHA = 0.05
 RANDOM_SEED = 42
+BOOTSTRAP_BATCH_BYTES = 64 * 2**20  # Max size of one bootstrap weight block
+
+# Maximum points drawn per scatter panel (fits use the full data)
+MAX_SCATTER_POINTS = 50_000
+# Panels drawn with style="hex" fall back to a scatter below this size
+HEXBIN_MIN_POINTS = 20_000
+
+# Temperature bins used to fit the exponential model on binned means
+N_FIT_BINS = 22
 
 # Plot settings
 plt.rcParams.update({
@@ -66,35 +104,207 @@ plt.rcParams.update({
 })
 
 
+if HAS_NUMBA:
+    # Fast-math without the no-NaN/no-Inf assumptions: unsettled particles
+    # carry NaN settlement coordinates that must propagate to the output.
+    @njit(parallel=True, cache=True,
+          fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})
+    def _haversine_km(lon1, lat1, lon2, lat2, out):
+        """Fused great-circle distance kernel (km), written into out."""
+        for i in prange(lon1.shape[0]):
+            lat1_rad = math.radians(lat1[i])
+            lat2_rad = math.radians(lat2[i])
+            dlat = lat2_rad - lat1_rad
+            dlon = math.radians(lon2[i] - lon1[i])
+            a = (math.sin(dlat / 2) ** 2 +
+                 math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2)
+            out[i] = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+    @njit(parallel=True, cache=True)
+    def _moments_kernel(x, y, c):
+        """Single-pass sums of u, u^2, u^3, u^4, y, uy, u^2 y, y^2 (u = x - c)."""
+        su = su2 = su3 = su4 = sy = suy = su2y = syy = 0.0
+        for i in prange(x.shape[0]):
+            u = x[i] - c
+            u2 = u * u
+            yi = y[i]
+            su += u
+            su2 += u2
+            su3 += u2 * u
+            su4 += u2 * u2
+            sy += yi
+            suy += u * yi
+            su2y += u2 * yi
+            syy += yi * yi
+        return su, su2, su3, su4, sy, suy, su2y, syy
+
+
+def _bin_statistics(x: np.ndarray, y: np.ndarray, edges: np.ndarray) -> tuple:
+    """
+    Per-bin count, mean and standard error of y, binned on x.
+
+    Bins are half-open [lo, hi); values outside the edges are ignored.
+
+    Returns:
+        (counts, means, sems); means/sems are NaN where a bin has < 2 values
+    """
+    n_bins = len(edges) - 1
+    idx = np.digitize(x, edges) - 1
+    inside = (idx >= 0) & (idx < n_bins)
+    idx = idx[inside]
+    v = np.asarray(y)[inside].astype(np.float64)
+
+    counts = np.bincount(idx, minlength=n_bins)
+    sums = np.bincount(idx, weights=v, minlength=n_bins)
+    sqsums = np.bincount(idx, weights=v * v, minlength=n_bins)
+
+    # Preallocated NaN outputs, filled only where a bin has >= 2 values
+    ok = counts > 1
+    means = np.full(n_bins, np.nan)
+    sems = np.full(n_bins, np.nan)
+    np.divide(sums, counts, out=means, where=ok)
+    np.subtract(sqsums, sums * means, out=sqsums, where=ok)    # (n-1) * var
+    np.maximum(sqsums, 0.0, out=sqsums)
+    np.divide(sqsums, counts * (counts - 1.0), out=sems, where=ok)
+    np.sqrt(sems, out=sems)
+    return counts, means, sems
+
+
+def _poly_moments(x: np.ndarray, y: np.ndarray) -> tuple:
+    """
+    Moment sums for closed-form linear/quadratic least squares.
+
+    x is shifted by its first value before accumulating so the higher
+    powers stay well conditioned in float64.
+
+    Returns:
+        (n, shift, sums) with sums = [Su, Su2, Su3, Su4, Sy, Suy, Su2y, Syy]
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    c = float(x[0])
+    if HAS_NUMBA:
+        return len(x), c, np.array(_moments_kernel(x, y, c))
+    u = x - c
+    u2 = u * u
+    sums = np.array([u.sum(), u2.sum(), u2 @ u, u2 @ u2, y.sum(),
+                     u @ y, u2 @ y, y @ y])
+    return len(x), c, sums
+
+
+def _rank_correlation(rx: np.ndarray, ry: np.ndarray) -> tuple:
+    """
+    Pearson correlation of pre-ranked data (i.e. Spearman's rho).
+
+    The p-value uses the same t-distribution approximation as
+    scipy.stats.spearmanr, without re-validating or re-ranking the input.
+    """
+    n = len(rx)
+    r = np.corrcoef(rx, ry)[0, 1]
+    t = r * np.sqrt((n - 2) / max(1 - r * r, 1e-300))  # finite at |r| = 1
+    p = 2.0 * stats.distributions.t.sf(abs(t), n - 2)
+    return r, p
+
+
+def _bootstrap_rank_ci(rx: np.ndarray, ry: np.ndarray, n_boot: int = N_BOOTSTRAP,
+                       alpha: float = ALPHA, seed: int = RANDOM_SEED) -> tuple:
+    """
+    Percentile bootstrap CI for Spearman's r from pre-ranked data.
+
+    Each replicate is a multinomial weight vector over the N particles
+    (Algorithm 2 of the weighted bootstrap), so B replicates reduce to a
+    (B x N) @ (N x 5) product instead of B resample-and-rank passes. Ranks
+    are taken from the full sample and not re-ranked per replicate, which
+    is a close approximation for large N. Replicates are processed in
+    batches so the weight matrix stays within BOOTSTRAP_BATCH_BYTES.
+
+    Returns:
+        (lower, upper) bounds at the given alpha
+    """
+    n = len(rx)
+    rng = np.random.default_rng(seed)
+
+    # Centered ranks keep the weighted moments well conditioned
+    cx = rx - rx.mean()
+    cy = ry - ry.mean()
+    features = np.column_stack([cx, cy, cx * cx, cy * cy, cx * cy])
+
+    batch = max(1, min(n_boot, BOOTSTRAP_BATCH_BYTES // (8 * n)))
+    r_boot = np.empty(n_boot)
+    for start in range(0, n_boot, batch):
+        size = min(batch, n_boot - start)
+        # Multinomial(n, 1/n) counts per replicate, tallied in one bincount
+        draws = rng.integers(0, n, size=(size, n))
+        draws += (np.arange(size) * n)[:, None]
+        weights = np.bincount(draws.ravel(), minlength=size * n).reshape(size, n) / n
+        mx, my, sxx, syy, sxy = (weights @ features).T
+        cov = sxy - mx * my
+        var_x = sxx - mx * mx
+        var_y = syy - my * my
+        r_boot[start:start + size] = cov / np.sqrt(var_x * var_y)
+
+    return tuple(np.percentile(r_boot, [100 * alpha / 2, 100 * (1 - alpha / 2)]))
+
+
+def _fast_spearman(x, y) -> tuple:
+    """Spearman correlation with a single rankdata pass per variable."""
+    return _rank_correlation(stats.rankdata(x), stats.rankdata(y))
+
+
 class DispersalAnalyzer:
     """Analyze dispersal distance patterns in relation to temperature."""
 
     def __init__(self, data_dir: Path):
         self.data_dir = data_dir
         self.particle_data = {}
+        # Linear fits per plot panel, reset whenever data are reloaded
+        self._linear_fits = {}
 
     def load_particle_data(self, year: int) -> pd.DataFrame:
         """
         Load per-particle summary data.
 
+        The processed frame (including distances and ranks) is cached as a
+        Parquet file next to the CSV and reused while it is newer than the CSV.
+
         Parameters:
             year: Year to load
 
         Returns:
             DataFrame with particle data
         """
+        df, cache_path, processed = self._read_year(year)
+        if processed:
+            return df
+        return self._process_year(year, df, cache_path)
+
+    def _read_year(self, year: int) -> tuple:
+        """
+        Read one year from the Parquet cache or the raw CSV (I/O only).
+
+        Returns:
+            (DataFrame, cache path, whether the frame is already processed)
+        """
         file_path = (self.data_dir / f"output_dir_{year}" /
                     "analysis_outputs_v10" / "per_particle_summary_rel_v10.csv")
+        cache_path = file_path.with_suffix(".parquet")
 
         if not file_path.exists():
             print(f"Warning: No data for {year}")
-            return pd.DataFrame()
+            return pd.DataFrame(), cache_path, True
+
+        if (cache_path.exists() and
+                cache_path.stat().st_mtime >= file_path.stat().st_mtime):
+            return pd.read_parquet(cache_path), cache_path, True
 
-        df = pd.read_csv(file_path, encoding="utf-8-sig", low_memory=False)
+        return self._read_particle_csv(file_path), cache_path, False
 
-        # Process columns
+    def _process_year(self, year: int, df: pd.DataFrame,
+                      cache_path: Path) -> pd.DataFrame:
+        """Filter, derive distances/ranks for a raw year frame and cache it."""
+        # Process columns (zones outside MPA_ORDER were read as NaN codes)
         if "zone_release" in df.columns:
-            df = df[df["zone_release"].isin(MPA_ORDER)]
+            df = df[df["zone_release"].cat.codes >= 0]
 
         # Calculate dispersal distance if not present
         if "distance_km" not in df.columns and all(col in df.columns for col in
@@ -113,126 +323,211 @@ class DispersalAnalyzer:
         df = df[df["distance_km"].notna() & df["temp_mean_egg"].notna()]
         df = df[df["distance_km"] >= 0]  # Remove invalid distances
 
+        # Downcast derived columns (ranks keep float64: ties average to .5)
+        df = df.astype({"distance_km": "float32", "temp_mean_egg": "float32"})
+
+        # Cache within-year ranks for per-year Spearman correlations
+        df["rank_temp"] = stats.rankdata(df["temp_mean_egg"])
+        df["rank_dist"] = stats.rankdata(df["distance_km"])
+
         # Add year info
-        df["year"] = year
-        df["year_type"] = self._classify_year(year)
+        df["year"] = np.int16(year)
+        codes = np.full(len(df), self._year_type_code(year), dtype=np.int8)
+        df["year_type"] = pd.Categorical.from_codes(codes, dtype=YEAR_TYPE_DTYPE)
 
+        self._write_cache(df, cache_path)
         return df
 
-    def _haversine_distance(self, lon1, lat1, lon2, lat2):
-        """Calculate great-circle distance in km."""
-        R = 6371.0  # Earth radius in km
-
-        lon1_rad = np.radians(lon1)
-        lat1_rad = np.radians(lat1)
-        lon2_rad = np.radians(lon2)
-        lat2_rad = np.radians(lat2)
+    def _write_cache(self, df: pd.DataFrame, cache_path: Path):
+        """Save processed particle data as Parquet (skipped without an engine)."""
+        try:
+            df.to_parquet(cache_path, compression="zstd", index=False)
+        except ImportError:
+            pass
+        except OSError as exc:
+            print(f"Warning: Could not write cache {cache_path}: {exc}")
+
+    def _read_particle_csv(self, file_path: Path) -> pd.DataFrame:
+        """Read the needed columns, using the pyarrow parser when available."""
+        header = pd.read_csv(file_path, encoding="utf-8-sig", nrows=0).columns
+        usecols = [c for c in PARTICLE_USECOLS if c in header]
+        dtype = {c: t for c, t in PARTICLE_DTYPES.items() if c in usecols}
 
-        dlon = lon2_rad - lon1_rad
-        dlat = lat2_rad - lat1_rad
+        try:
+            return pd.read_csv(file_path, engine="pyarrow", encoding="utf-8-sig",
+                               usecols=usecols, dtype=dtype)
+        except (ImportError, ValueError):
+            return pd.read_csv(file_path, engine="c", encoding="utf-8-sig",
+                               usecols=usecols, dtype=dtype)
 
-        a = np.sin(dlat/2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon/2)**2
-        c = 2 * np.arcsin(np.sqrt(a))
+    def _haversine_distance(self, lon1, lat1, lon2, lat2):
+        """Calculate great-circle distance in km (scalars or arrays)."""
+        if all(np.ndim(v) == 0 for v in (lon1, lat1, lon2, lat2)):
+            # Scalars (Python or NumPy): math avoids NumPy's per-call overhead
+            lon1, lat1, lon2, lat2 = map(float, (lon1, lat1, lon2, lat2))
+            lat1_rad = math.radians(lat1)
+            lat2_rad = math.radians(lat2)
+            dlat = lat2_rad - lat1_rad
+            dlon = math.radians(lon2 - lon1)
+            a = (math.sin(dlat / 2) ** 2 +
+                 math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2)
+            return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+        if HAS_NUMBA:
+            out = np.empty(np.size(lon1), dtype=np.float64)
+            _haversine_km(np.asarray(lon1, dtype=np.float64).ravel(),
+                          np.asarray(lat1, dtype=np.float64).ravel(),
+                          np.asarray(lon2, dtype=np.float64).ravel(),
+                          np.asarray(lat2, dtype=np.float64).ravel(), out)
+            return pd.Series(out, index=getattr(lon1, "index", None))
+
+        R = EARTH_RADIUS_KM
+
+        # One contiguous (4, N) block, converted and reduced in place
+        coords = np.array([lon1, lat1, lon2, lat2], dtype=np.float64)
+        np.radians(coords, out=coords)
+        lon1_rad, lat1_rad, lon2_rad, lat2_rad = coords
 
-        return R * c
+        dlat = lat2_rad - lat1_rad
+        dlon = np.subtract(lon2_rad, lon1_rad, out=lon2_rad)
+
+        # cos(lat1) * cos(lat2) * sin(dlon/2)**2
+        cos_lat = np.cos(lat1_rad, out=lat1_rad)
+        cos_lat *= np.cos(lat2_rad, out=lat2_rad)
+        dlon *= 0.5
+        np.sin(dlon, out=dlon)
+        dlon *= dlon
+        dlon *= cos_lat
+
+        # a = sin(dlat/2)**2 + ..., then c = 2 * arcsin(sqrt(a))
+        a = dlat
+        a *= 0.5
+        np.sin(a, out=a)
+        a *= a
+        a += dlon
+        np.sqrt(a, out=a)
+        np.arcsin(a, out=a)
+        a *= 2 * R
+
+        return pd.Series(a, index=getattr(lon1, "index", None))
 
     def _classify_year(self, year: int) -> str:
         """Classify year as warm/cold/neutral."""
-        if year in WARM_YEARS:
+        if year in WARM_SET:
             return "warm"
-        elif year in COLD_YEARS:
+        elif year in COLD_SET:
             return "cold"
         else:
             return "neutral"
 
+    def _year_type_code(self, year: int) -> int:
+        """Categorical code of the year's type (index into YEAR_TYPES)."""
+        return YEAR_TYPES.index(self._classify_year(year))
+
+    def _classify_years(self, years) -> np.ndarray:
+        """Vectorized year-type codes (0 warm, 1 cold, 2 neutral) for an array of years."""
+        years = np.asarray(years)
+        return np.where(np.isin(years, WARM_YEARS), 0,
+                        np.where(np.isin(years, COLD_YEARS), 1, 2)).astype(np.int8)
+
     def load_all_years(self):
-        """Load data for all years."""
-        for year in YEARS:
-            df = self.load_particle_data(year)
+        """
+        Load data for all years.
+
+        Files are read in a thread pool (CSV/Parquet parsing releases the
+        GIL). Processing stays on the calling thread so the Numba kernels
+        are never launched from worker threads.
+        """
+        self._linear_fits.clear()
+        max_workers = min(len(YEARS), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            reads = list(executor.map(self._read_year, YEARS))
+
+        for year, (df, cache_path, processed) in zip(YEARS, reads):
+            if not processed:
+                df = self._process_year(year, df, cache_path)
             if not df.empty:
                 self.particle_data[year] = df
                 print(f"Loaded {year}: {len(df)} particles")
 
-    def calculate_correlations(self) -> pd.DataFrame:
+    def calculate_correlations(self, bootstrap: bool = False) -> pd.DataFrame:
         """
         Calculate temperature-distance correlations.
 
+        Parameters:
+            bootstrap: Add N_BOOTSTRAP percentile CIs for Spearman's r
+
         Returns:
             DataFrame with correlation statistics
         """
         results = []
 
-        # Overall correlation
-        all_data = pd.concat(self.particle_data.values(), ignore_index=True)
-        if not all_data.empty:
-            r, p = stats.spearmanr(all_data["temp_mean_egg"],
-                                   all_data["distance_km"])
-            results.append({
-                "Group": "All years",
-                "N": len(all_data),
-                "Spearman_r": r,
-                "p_value": p
-            })
+        def add(group, rx, ry):
+            r, p = _rank_correlation(rx, ry)
+            row = {"Group": group, "N": len(rx), "Spearman_r": r, "p_value": p}
+            if bootstrap:
+                row["CI_lower"], row["CI_upper"] = _bootstrap_rank_ci(rx, ry)
+            results.append(row)
+
+        # Raw arrays per year type; each aggregation level is ranked once
+        groups = {year_type: self._stacked_arrays(year_type)
+                  for year_type in YEAR_TYPES}
+
+        # Overall correlation (pooled data must be re-ranked)
+        all_temp = np.concatenate([groups[yt][0] for yt in YEAR_TYPES])
+        all_dist = np.concatenate([groups[yt][1] for yt in YEAR_TYPES])
+        if len(all_temp) > 0:
+            add("All years", stats.rankdata(all_temp), stats.rankdata(all_dist))
 
         # By year type
-        for year_type in ["warm", "cold", "neutral"]:
-            data = all_data[all_data["year_type"] == year_type]
-            if len(data) > 10:
-                r, p = stats.spearmanr(data["temp_mean_egg"],
-                                       data["distance_km"])
-                results.append({
-                    "Group": f"{year_type.capitalize()} years",
-                    "N": len(data),
-                    "Spearman_r": r,
-                    "p_value": p
-                })
-
-        # By individual year
+        for year_type in YEAR_TYPES:
+            temp, dist = groups[year_type]
+            if len(temp) > 10:
+                add(f"{year_type.capitalize()} years",
+                    stats.rankdata(temp), stats.rankdata(dist))
+
+        # By individual year (reuse ranks cached at load time)
         for year in sorted(self.particle_data.keys()):
             data = self.particle_data[year]
             if len(data) > 10:
-                r, p = stats.spearmanr(data["temp_mean_egg"],
-                                       data["distance_km"])
-                results.append({
-                    "Group": str(year),
-                    "N": len(data),
-                    "Spearman_r": r,
-                    "p_value": p
-                })
+                add(str(year), data["rank_temp"].values, data["rank_dist"].values)
 
         return pd.DataFrame(results)
 
-    def fit_regression_models(self, data: pd.DataFrame) -> dict:
+    def fit_regression_models(self, data: pd.DataFrame, binned: tuple = None) -> dict:
         """
         Fit various regression models to temperature-distance data.
 
         Parameters:
             data: DataFrame with temp_mean_egg and distance_km columns
+            binned: Optional precomputed (bin_centers, bin_means, bin_counts)
+                used for the exponential fit
 
         Returns:
             Dictionary of fitted models and parameters
         """
-        x = data["temp_mean_egg"].values
-        y = data["distance_km"].values
+        return self._fit_models(data["temp_mean_egg"].values,
+                                data["distance_km"].values, binned)
 
+    def _fit_models(self, x: np.ndarray, y: np.ndarray, binned: tuple = None) -> dict:
+        """Fit linear, quadratic and exponential models to x/y arrays."""
         models = {}
+        moments = _poly_moments(x, y)
 
         # Linear regression
-        slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
-        models["linear"] = {
-            "slope": slope,
-            "intercept": intercept,
-            "r_squared": r_value**2,
-            "p_value": p_value,
-            "predict": lambda t: slope * t + intercept
-        }
-
-        # Polynomial regression (quadratic)
-        poly_coef = np.polyfit(x, y, 2)
+        models["linear"] = self._fit_linear(x, y, moments)
+
+        # Polynomial regression (quadratic), normal equations in u = x - c
+        n, c, (su, su2, su3, su4, sy, suy, su2y, syy) = moments
+        lhs = np.array([[su4, su3, su2],
+                        [su3, su2, su],
+                        [su2, su, n]])
+        rhs = np.array([su2y, suy, sy])
+        a, b, d = np.linalg.solve(lhs, rhs)
+        poly_coef = np.array([a, b - 2 * a * c, a * c * c - b * c + d])
         poly_func = np.poly1d(poly_coef)
-        y_pred = poly_func(x)
-        ss_res = np.sum((y - y_pred)**2)
-        ss_tot = np.sum((y - np.mean(y))**2)
+        ss_tot = syy - sy * sy / n
+        ss_res = syy - (a * su2y + b * suy + d * sy)
         r_squared = 1 - (ss_res / ss_tot)
         models["quadratic"] = {
             "coefficients": poly_coef,
@@ -240,15 +535,30 @@ class DispersalAnalyzer:
             "predict": poly_func
         }
 
-        # Exponential model: y = a * exp(b * x)
+        # Exponential model: y = a * exp(b * x), fitted on temperature-binned
+        # means weighted by bin size instead of on every particle
         try:
             def exp_func(x, a, b):
                 return a * np.exp(b * x)
 
-            popt, pcov = curve_fit(exp_func, x, y, p0=[100, 0.01], maxfev=5000)
+            if binned is None:
+                edges = np.linspace(x.min(), x.max(), N_FIT_BINS + 1)
+                edges[-1] = np.nextafter(edges[-1], np.inf)  # include the max
+                counts, means, _ = _bin_statistics(x, y, edges)
+                binned = ((edges[:-1] + edges[1:]) / 2, means, counts)
+            centers, means, counts = (np.asarray(v) for v in binned)
+            ok = (counts > 0) & np.isfinite(means)
+            centers, means, counts = centers[ok], means[ok], counts[ok]
+
+            p0 = [100, 0.01]
+            if means[0] > 0 and means[-1] > 0 and centers[-1] > centers[0]:
+                b0 = np.log(means[-1] / means[0]) / (centers[-1] - centers[0])
+                p0 = [means[0] / np.exp(b0 * centers[0]), b0]
+
+            popt, pcov = curve_fit(exp_func, centers, means, p0=p0,
+                                   sigma=1 / np.sqrt(counts), maxfev=5000)
             y_pred = exp_func(x, *popt)
             ss_res = np.sum((y - y_pred)**2)
-            ss_tot = np.sum((y - np.mean(y))**2)
             r_squared = 1 - (ss_res / ss_tot)
 
             models["exponential"] = {
@@ -262,6 +572,33 @@ class DispersalAnalyzer:
 
         return models
 
+    def _fit_linear(self, x: np.ndarray, y: np.ndarray,
+                    moments: tuple = None) -> dict:
+        """
+        Fit an ordinary least-squares line to x/y arrays.
+
+        Closed-form equivalent of stats.linregress from one pass of moment
+        sums (reused when the caller already has them).
+        """
+        n, c, (su, su2, _, _, sy, suy, _, syy) = (
+            moments if moments is not None else _poly_moments(x, y))
+        sxx = su2 - su * su / n
+        sxy = suy - su * sy / n
+        syy_c = syy - sy * sy / n
+        slope = sxy / sxx
+        intercept = (sy - slope * su) / n - slope * c
+        r_value = np.clip(sxy / np.sqrt(sxx * syy_c), -1.0, 1.0)
+        dof = n - 2
+        t = r_value * np.sqrt(dof / max((1 - r_value) * (1 + r_value), 1e-300))
+        p_value = 2 * stats.distributions.t.sf(abs(t), dof)
+        return {
+            "slope": slope,
+            "intercept": intercept,
+            "r_squared": r_value**2,
+            "p_value": p_value,
+            "predict": lambda t: slope * t + intercept
+        }
+
     def plot_temperature_distance_relationship(self, output_path: Path = None):
         """
         Create comprehensive temperature-distance relationship figure.
@@ -273,8 +610,13 @@ class DispersalAnalyzer:
         if not self.particle_data:
             self.load_all_years()
 
-        # Combine all data
-        all_data = pd.concat(self.particle_data.values(), ignore_index=True)
+        # Temperature/distance arrays per regime (no pooled DataFrame copy)
+        groups = {year_type: self._stacked_arrays(year_type)
+                  for year_type in YEAR_TYPES}
+        all_temp = np.concatenate([df["temp_mean_egg"].to_numpy()
+                                   for df in self.particle_data.values()])
+        all_dist = np.concatenate([df["distance_km"].to_numpy()
+                                   for df in self.particle_data.values()])
 
         # Create figure with multiple panels
         fig = plt.figure(figsize=(16, 12))
@@ -282,21 +624,22 @@ class DispersalAnalyzer:
 
         # Panel A: Overall relationship
         ax1 = fig.add_subplot(gs[0, 0])
-        self._plot_scatter(ax1, all_data, "All years (2014-2022)")
+        self._plot_scatter(ax1, all_temp, all_dist, "All years (2014-2022)",
+                          key="all", style="hex")
 
         # Panel B: Warm years
         ax2 = fig.add_subplot(gs[0, 1])
-        warm_data = all_data[all_data["year_type"] == "warm"]
-        self._plot_scatter(ax2, warm_data, "Warm years", COLOR_WARM)
+        self._plot_scatter(ax2, *groups["warm"], "Warm years", COLOR_WARM,
+                          key="warm")
 
         # Panel C: Cold years
         ax3 = fig.add_subplot(gs[1, 0])
-        cold_data = all_data[all_data["year_type"] == "cold"]
-        self._plot_scatter(ax3, cold_data, "Cold years", COLOR_COLD)
+        self._plot_scatter(ax3, *groups["cold"], "Cold years", COLOR_COLD,
+                          key="cold")
 
         # Panel D: Comparison
         ax4 = fig.add_subplot(gs[1, 1])
-        self._plot_comparison(ax4, all_data)
+        self._plot_comparison(ax4, groups)
 
         plt.suptitle("Temperature-dispersal distance relationships",
                     fontsize=14, fontweight='bold')
@@ -307,32 +650,59 @@ class DispersalAnalyzer:
 
         return fig
 
-    def _plot_scatter(self, ax, data, title, color="#4169E1", alpha=0.3):
-        """Plot scatter with regression line."""
-        if data.empty:
+    def _stacked_arrays(self, year_type: str) -> tuple:
+        """Concatenate temperature and distance arrays for one year type."""
+        frames = [df for year, df in self.particle_data.items()
+                  if self._classify_year(year) == year_type]
+        if not frames:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+        return (np.concatenate([df["temp_mean_egg"].to_numpy() for df in frames]),
+                np.concatenate([df["distance_km"].to_numpy() for df in frames]))
+
+    def _plot_scatter(self, ax, x, y, title, color="#4169E1", alpha=0.3,
+                      key=None, style="scatter"):
+        """
+        Plot scatter with regression line (fit cached under ``key``).
+
+        style="hex" draws a log-count hexbin density instead of points once
+        the panel has at least HEXBIN_MIN_POINTS particles.
+        """
+        if len(x) == 0:
             ax.text(0.5, 0.5, "No data", transform=ax.transAxes,
                    ha='center', va='center')
             ax.set_title(title)
             return
 
-        x = data["temp_mean_egg"]
-        y = data["distance_km"]
-
-        # Scatter plot
-        ax.scatter(x, y, alpha=alpha, s=1, color=color, rasterized=True)
+        # Density (hexbin) or scatter plot (random subsample; the cloud
+        # looks the same)
+        if style == "hex" and len(x) >= HEXBIN_MIN_POINTS:
+            hb = ax.hexbin(x, y, gridsize=150, bins='log', cmap='viridis',
+                          mincnt=1, rasterized=True)
+            ax.figure.colorbar(hb, ax=ax, label='count')
+        elif len(x) > MAX_SCATTER_POINTS:
+            rng = np.random.default_rng(RANDOM_SEED)
+            sel = rng.choice(len(x), MAX_SCATTER_POINTS, replace=False)
+            ax.scatter(x[sel], y[sel], alpha=alpha, s=1, color=color,
+                      rasterized=True)
+        else:
+            ax.scatter(x, y, alpha=alpha, s=1, color=color, rasterized=True)
 
-        # Fit and plot regression line
-        models = self.fit_regression_models(data)
+        # Fit and plot regression line (only the linear model is drawn)
+        cache_key = (key, len(x))
+        linear = self._linear_fits.get(cache_key) if key is not None else None
+        if linear is None:
+            linear = self._fit_linear(x, y)
+            if key is not None:
+                self._linear_fits[cache_key] = linear
 
-        # Plot linear regression
         x_range = np.linspace(x.min(), x.max(), 100)
-        y_pred = models["linear"]["predict"](x_range)
+        y_pred = linear["predict"](x_range)
         ax.plot(x_range, y_pred, 'r-', linewidth=2,
-               label=f'Linear (R²={models["linear"]["r_squared"]:.3f})')
+               label=f'Linear (R²={linear["r_squared"]:.3f})')
 
         # Add statistics
-        r, p = stats.spearmanr(x, y)
-        ax.text(0.05, 0.95, f'n = {len(data):,}\nr = {r:.3f}\np = {p:.3e}',
+        r, p = _fast_spearman(x, y)
+        ax.text(0.05, 0.95, f'n = {len(x):,}\nr = {r:.3f}\np = {p:.3e}',
                transform=ax.transAxes, verticalalignment='top',
                bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
 
@@ -342,37 +712,22 @@ class DispersalAnalyzer:
         ax.legend(loc='upper right')
         ax.grid(True, alpha=0.3)
 
-    def _plot_comparison(self, ax, all_data):
+    def _plot_comparison(self, ax, groups):
         """Plot comparison of warm vs cold years."""
-        warm_data = all_data[all_data["year_type"] == "warm"]
-        cold_data = all_data[all_data["year_type"] == "cold"]
-        neutral_data = all_data[all_data["year_type"] == "neutral"]
-
         # Calculate mean distances by temperature bins
         temp_bins = np.arange(20, 31, 0.5)
-
-        for data, color, label in [(warm_data, COLOR_WARM, "Warm years"),
-                                   (cold_data, COLOR_COLD, "Cold years"),
-                                   (neutral_data, COLOR_NEUTRAL, "Neutral years")]:
-            if not data.empty:
-                means = []
-                stds = []
-                for i in range(len(temp_bins) - 1):
-                    mask = (data["temp_mean_egg"] >= temp_bins[i]) & \
-                           (data["temp_mean_egg"] < temp_bins[i+1])
-                    bin_data = data[mask]["distance_km"]
-                    if len(bin_data) > 10:
-                        means.append(bin_data.mean())
-                        stds.append(bin_data.std() / np.sqrt(len(bin_data)))
-                    else:
-                        means.append(np.nan)
-                        stds.append(np.nan)
-
-                bin_centers = (temp_bins[:-1] + temp_bins[1:]) / 2
-                valid = ~np.isnan(means)
-
-                ax.errorbar(bin_centers[valid], np.array(means)[valid],
-                          yerr=np.array(stds)[valid],
+        bin_centers = (temp_bins[:-1] + temp_bins[1:]) / 2
+
+        for year_type, color, label in [("warm", COLOR_WARM, "Warm years"),
+                                        ("cold", COLOR_COLD, "Cold years"),
+                                        ("neutral", COLOR_NEUTRAL, "Neutral years")]:
+            temp, dist = groups[year_type]
+            if len(temp) > 0:
+                counts, means, stds = _bin_statistics(temp, dist, temp_bins)
+                valid = counts > 10
+
+                ax.errorbar(bin_centers[valid], means[valid],
+                          yerr=stds[valid],
                           marker='o', label=label, color=color,
                           linewidth=2, markersize=6, capsize=3)
 
@@ -14,27 +14,60 @@ Key analyses:
 - Robust regression (Theil-Sen) with confidence intervals
 """
 
+import csv
+import functools
+import hashlib
+import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.lines import Line2D
-from scipy.stats import spearmanr, theilslopes
+from scipy.stats import theilslopes
 from scipy import stats
-import seaborn as sns
 
-warnings.filterwarnings('ignore')
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 # ----------------- Configuration -----------------
 YEARS = [2014, 2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022]
 MPA_ORDER = ["MNR-7", "MNR-8-N", "MNR-8-S", "SMPA-2", "SMPA-4"]
 
+# Neighboring MPAs used for local retention (simplified - you can customize)
+MPA_NEIGHBORS = {
+    "MNR-7": ["MNR-8-N", "MNR-8-S"],
+    "MNR-8-N": ["MNR-7", "MNR-8-S"],
+    "MNR-8-S": ["MNR-7", "MNR-8-N"],
+    "SMPA-2": ["SMPA-4"],
+    "SMPA-4": ["SMPA-2"]
+}
+
+# Self + neighbor mask over MPA_ORDER (rows: origin, columns: destination)
+_NEIGHBOR_MASK = np.eye(len(MPA_ORDER), dtype=bool)
+for _i, _mpa in enumerate(MPA_ORDER):
+    for _neighbor in MPA_NEIGHBORS.get(_mpa, []):
+        if _neighbor in MPA_ORDER:
+            _NEIGHBOR_MASK[_i, MPA_ORDER.index(_neighbor)] = True
+_HAS_NEIGHBORS = np.array([m in MPA_NEIGHBORS for m in MPA_ORDER])
+_MPA_POSITION = {m: i for i, m in enumerate(MPA_ORDER)}
+
 # Temperature-based year classification (egg stage)
 WARM_YEARS = {2017, 2018, 2022}    # Ty > P75 based on egg stage
 COLD_YEARS = {2014, 2015, 2020}    # Ty < P25 based on egg stage
 NEUTRAL_YEARS = {2016, 2019, 2021} # P25 ≤ Ty ≤ P75 based on egg stage
+YEAR_TYPE_MAP = {**{y: 'warm' for y in WARM_YEARS},
+                 **{y: 'cold' for y in COLD_YEARS}}  # Anything else is neutral
+
+# Per-particle columns needed for Ty/EAT (all others are skipped on read)
+PARTICLE_USECOLS = ["temp_mean_egg", "temp_mean", "hot_deg_h_egg", "cold_deg_h_egg"]
+
+# Compiled year metrics are cached here (relative to data_dir)
+METRICS_CACHE_NAME = "year_metrics_cache.parquet"
 
 # Statistical parameters
 N_BOOTSTRAP = 1000
@@ -52,8 +85,17 @@ MARKER_COLD = 'o'    # Circle
 MARKER_NEUTRAL = 's'  # Square
 MARKER_WARM = '^'     # Triangle
 
-# Plot settings
-plt.rcParams.update({
+# Scatter style per year type: (color, marker, legend label)
+YEAR_TYPE_STYLE = {
+    'cold': (COLOR_COLD, MARKER_COLD, 'Cold years'),
+    'neutral': (COLOR_NEUTRAL, MARKER_NEUTRAL, 'Neutral years'),
+    'warm': (COLOR_WARM, MARKER_WARM, 'Warm years')
+}
+# Categories in draw/legend order
+YEAR_TYPE_DTYPE = pd.CategoricalDtype(list(YEAR_TYPE_STYLE))
+
+# Plot settings (applied lazily by _configure_plots)
+PLOT_STYLE = {
     'font.family': 'sans-serif',
     'font.sans-serif': ['Arial', 'Helvetica', 'DejaVu Sans'],
     'font.size': 10,
@@ -74,7 +116,71 @@ plt.rcParams.update({
     'savefig.pad_inches': 0.1,
     'pdf.fonttype': 42,
     'svg.fonttype': 'none'
-})
+}
+
+
+def _configure_plots():
+    """Import pyplot on first use and apply PLOT_STYLE; returns pyplot."""
+    import matplotlib.pyplot as plt
+    plt.rcParams.update(PLOT_STYLE)
+    return plt
+
+
+def _quiet_nanmean(values) -> float:
+    """nanmean that returns NaN for all-NaN input without a RuntimeWarning."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        return np.nanmean(values)
+
+
+def _pearson_matrix(M: np.ndarray) -> tuple:
+    """
+    Pearson correlations between all columns of M with two-sided p-values.
+
+    The p-values use the t-distribution form (n - 2 degrees of freedom),
+    which is equivalent to the exact test in scipy.stats.pearsonr.
+    """
+    n = M.shape[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R = np.corrcoef(M, rowvar=False)  # Constant columns give NaN
+        t = R * np.sqrt((n - 2) / np.maximum(1 - R * R, 1e-300))
+    P = 2 * stats.distributions.t.sf(np.abs(t), n - 2)
+    return R, P
+
+
+@functools.lru_cache(maxsize=32)
+def _ranks_from_bytes(buffer: bytes) -> np.ndarray:
+    ranks = stats.rankdata(np.frombuffer(buffer, dtype=np.float64))
+    ranks.setflags(write=False)  # Shared between callers
+    return ranks
+
+
+def _ranked(values) -> np.ndarray:
+    """Average-tie ranks of a 1-D array, memoized on its contents (read-only)."""
+    arr = np.ascontiguousarray(values, dtype=np.float64)
+    return _ranks_from_bytes(arr.tobytes())
+
+
+@functools.lru_cache(maxsize=32)
+def _theil_from_bytes(y_buffer: bytes, x_buffer: bytes) -> tuple:
+    y = np.frombuffer(y_buffer, dtype=np.float64)
+    x = np.frombuffer(x_buffer, dtype=np.float64)
+    with warnings.catch_warnings():
+        # Degenerate x (all identical) yields NaN fits; that is reported as is
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        return tuple(theilslopes(y, x, alpha=0.95))
+
+
+def _theil_sen(y, x) -> tuple:
+    """Theil-Sen (slope, intercept, lo, hi) of y on x, memoized on the data."""
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    return _theil_from_bytes(y.tobytes(), x.tobytes())
+
+
+def _rank_columns(M: np.ndarray) -> np.ndarray:
+    """Average-tie ranks of every column of M in one vectorized call."""
+    return stats.rankdata(M, axis=0)
 
 
 class ExposureResponseAnalyzer:
@@ -84,180 +190,274 @@ class ExposureResponseAnalyzer:
         self.data_dir = data_dir
         self.year_metrics = {}
         self.connectivity_metrics = {}
+        # (exposure, response) -> (slope, intercept, lo, hi, spearman r, p)
+        self._fit_cache = {}
+
+    def load_particle_data(self, year: int) -> dict:
+        """
+        Load per-particle exposure columns for a year.
 
-    def load_particle_data(self, year: int) -> pd.DataFrame:
-        """Load per-particle summary data for a year."""
+        Only PARTICLE_USECOLS are parsed (pyarrow column projection when
+        available) and returned as float64 arrays; no DataFrame is built.
+
+        Returns:
+            Dictionary of column name -> np.ndarray (empty if the file has
+            particles but none of PARTICLE_USECOLS, so exposures are NaN),
+            or None if there is no particle data
+        """
         file_path = (self.data_dir / f"output_dir_{year}" /
                     "analysis_outputs_v10" / "per_particle_summary_rel_v10.csv")
 
         if not file_path.exists():
             print(f"Warning: No particle data for {year}")
-            return pd.DataFrame()
-
-        df = pd.read_csv(file_path, encoding="utf-8-sig", low_memory=False)
+            return None
+
+        first_row = pd.read_csv(file_path, encoding="utf-8-sig", nrows=1)
+        if first_row.empty:
+            return None
+
+        usecols = [c for c in PARTICLE_USECOLS if c in first_row.columns]
+        if not usecols:
+            # Nothing to parse (pyarrow would read every column for an empty
+            # include_columns); the year is kept with NaN exposures
+            return {}
+
+        if HAS_PYARROW:
+            table = pv.read_csv(file_path, convert_options=pv.ConvertOptions(
+                include_columns=usecols,
+                column_types={c: pa.float64() for c in usecols}))
+            data = {c: table.column(c).to_numpy() for c in usecols}
+        else:
+            df = pd.read_csv(file_path, encoding="utf-8-sig", usecols=usecols,
+                             dtype=float, low_memory=False)
+            data = {c: df[c].to_numpy() for c in usecols}
 
         # Ensure required columns
-        if "temp_mean_egg" not in df.columns and "temp_mean" in df.columns:
-            df["temp_mean_egg"] = df["temp_mean"]
+        if "temp_mean_egg" not in data and "temp_mean" in data:
+            data["temp_mean_egg"] = data["temp_mean"]
 
-        return df
+        return data
 
-    def load_connectivity_matrix(self, year: int) -> pd.DataFrame:
-        """Load normalized connectivity matrix for a year."""
+    def load_connectivity_matrix(self, year: int) -> np.ndarray:
+        """
+        Load normalized connectivity matrix for a year.
+
+        The small CSV is parsed directly into a (len(MPA_ORDER),)*2 array
+        with MPA_ORDER as the implicit row (origin) and column (destination)
+        axis. Missing cells of listed MPAs are 0; rows/columns of MPAs
+        absent from the file are NaN so metrics only average present MPAs.
+
+        Returns:
+            Aligned matrix (empty array if no data)
+        """
         file_path = (self.data_dir / f"output_dir_{year}" /
                     "analysis_outputs_v10" / "connectivity_matrix_normalized_v10.csv")
 
         if not file_path.exists():
             print(f"Warning: No connectivity matrix for {year}")
-            return pd.DataFrame()
-
-        df = pd.read_csv(file_path, index_col=0, encoding="utf-8-sig")
-
-        # Filter to MPA zones
-        rows = [r for r in MPA_ORDER if r in df.index]
-        cols = [c for c in MPA_ORDER if c in df.columns]
-        df = df.reindex(index=rows, columns=cols).fillna(0.0)
-
-        return df
-
-    def calculate_ty(self, particle_df: pd.DataFrame) -> float:
+            return np.empty((0, 0))
+
+        n = len(MPA_ORDER)
+        matrix = np.full((n, n), np.nan)
+        with open(file_path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])[1:]
+            col_pos = [_MPA_POSITION.get(c) for c in header]
+            cols = [j for j in col_pos if j is not None]
+            for row in reader:
+                i = _MPA_POSITION.get(row[0]) if row else None
+                if i is None:
+                    continue  # Filter to MPA zones
+                matrix[i, cols] = 0.0
+                for j, value in zip(col_pos, row[1:]):
+                    if j is not None and value.strip():
+                        value = float(value)
+                        if value == value:  # fillna(0.0)
+                            matrix[i, j] = value
+
+        return matrix
+
+    def calculate_ty(self, particle_data: dict) -> float:
         """
         Calculate Ty (mean egg-stage temperature).
 
         Parameters:
-            particle_df: DataFrame with particle data
+            particle_data: Particle columns (dict of arrays or DataFrame)
 
         Returns:
             Mean egg temperature (°C)
         """
-        if "temp_mean_egg" in particle_df.columns:
-            return particle_df["temp_mean_egg"].mean()
+        if "temp_mean_egg" in particle_data:
+            return _quiet_nanmean(particle_data["temp_mean_egg"])
         return np.nan
 
-    def calculate_eat(self, particle_df: pd.DataFrame) -> float:
+    def calculate_eat(self, particle_data: dict) -> float:
         """
         Calculate EAT (Effective Accumulated Temperature).
 
         EAT = mean(hot_degree_hours - cold_degree_hours) across particles
 
         Parameters:
-            particle_df: DataFrame with particle data
+            particle_data: Particle columns (dict of arrays or DataFrame)
 
         Returns:
             EAT value (degree-hours)
         """
-        if "hot_deg_h_egg" in particle_df.columns and "cold_deg_h_egg" in particle_df.columns:
-            eat = particle_df["hot_deg_h_egg"] - particle_df["cold_deg_h_egg"]
-            return eat.mean()
+        if "hot_deg_h_egg" in particle_data and "cold_deg_h_egg" in particle_data:
+            eat = (np.asarray(particle_data["hot_deg_h_egg"]) -
+                   np.asarray(particle_data["cold_deg_h_egg"]))
+            return _quiet_nanmean(eat)
 
         # Fallback calculation
-        if "temp_mean_egg" in particle_df.columns:
-            temp = particle_df["temp_mean_egg"]
+        if "temp_mean_egg" in particle_data:
+            temp = np.asarray(particle_data["temp_mean_egg"])
             hot = np.maximum(0, temp - 27.0)  # Above optimal high
             cold = np.maximum(0, 25.0 - temp)  # Below optimal low
-            return (hot - cold).mean()
+            return _quiet_nanmean(hot - cold)
 
         return np.nan
 
-    def calculate_connectivity_metrics(self, conn_matrix: pd.DataFrame) -> dict:
+    def calculate_connectivity_metrics(self, conn_matrix: np.ndarray) -> dict:
         """
         Calculate connectivity metrics from matrix.
 
         Parameters:
-            conn_matrix: Normalized connectivity matrix
+            conn_matrix: Normalized connectivity matrix aligned to MPA_ORDER
+                (NaN rows/columns mark MPAs missing from the data)
 
         Returns:
             Dictionary of metrics
         """
         metrics = {}
 
-        if conn_matrix.empty:
+        A = np.asarray(conn_matrix, dtype=float)
+        if A.size == 0 or np.isnan(A).all():
             return metrics
 
+        absent = np.isnan(A)
+        row_ok = ~absent.all(axis=1)
+        col_ok = ~absent.all(axis=0)
+        not_eye = ~np.eye(len(A), dtype=bool)
+        filled = np.where(absent, 0.0, A)  # One NaN pass; plain sums below
+
         # Self-recruitment (mean of diagonal)
-        diagonal = np.diag(conn_matrix.values)
-        metrics['self_recruitment'] = np.mean(diagonal)
+        diagonal = np.diag(A)
+        metrics['self_recruitment'] = _quiet_nanmean(diagonal)
+
+        # Off-diagonal totals as full row/column sums minus the diagonal
+        own = np.diag(filled)
 
         # Source strength (mean outgoing to other MPAs)
-        source_strength = []
-        for origin in conn_matrix.index:
-            row = conn_matrix.loc[origin]
-            others = [c for c in conn_matrix.columns if c != origin]
-            if others:
-                source_strength.append(row[others].sum())
-        metrics['source_strength'] = np.mean(source_strength) if source_strength else 0
+        has_others = (col_ok[None, :] & not_eye).any(axis=1)
+        source_strength = (filled.sum(axis=1) - own)[row_ok & has_others]
+        metrics['source_strength'] = source_strength.mean() if source_strength.size else 0
 
         # Sink strength (mean incoming from other MPAs)
-        sink_strength = []
-        for dest in conn_matrix.columns:
-            col = conn_matrix[dest]
-            others = [r for r in conn_matrix.index if r != dest]
-            if others:
-                sink_strength.append(col[others].sum())
-        metrics['sink_strength'] = np.mean(sink_strength) if sink_strength else 0
+        has_others = (row_ok[:, None] & not_eye).any(axis=0)
+        sink_strength = (filled.sum(axis=0) - own)[col_ok & has_others]
+        metrics['sink_strength'] = sink_strength.mean() if sink_strength.size else 0
 
         # Network connectivity (mean of all connections)
-        metrics['network_connectivity'] = conn_matrix.values.mean()
-
-        # Local retention (self + neighboring MPAs)
-        # Define neighbors (simplified - you can customize)
-        neighbors = {
-            "MNR-7": ["MNR-8-N", "MNR-8-S"],
-            "MNR-8-N": ["MNR-7", "MNR-8-S"],
-            "MNR-8-S": ["MNR-7", "MNR-8-N"],
-            "SMPA-2": ["SMPA-4"],
-            "SMPA-4": ["SMPA-2"]
-        }
-
-        local_retention = []
-        for mpa in conn_matrix.index:
-            if mpa in neighbors:
-                local = conn_matrix.loc[mpa, mpa]  # Self
-                for neighbor in neighbors[mpa]:
-                    if neighbor in conn_matrix.columns:
-                        local += conn_matrix.loc[mpa, neighbor]
-                local_retention.append(local)
-
-        metrics['local_retention'] = np.mean(local_retention) if local_retention else 0
+        metrics['network_connectivity'] = filled.sum() / (~absent).sum()
+
+        # Local retention (self + neighboring MPAs), via the precomputed mask
+        local_retention = (filled * _NEIGHBOR_MASK).sum(axis=1)[row_ok & _HAS_NEIGHBORS]
+
+        metrics['local_retention'] = local_retention.mean() if local_retention.size else 0
 
         return metrics
 
-    def compile_year_metrics(self):
-        """Compile metrics for all years."""
+    def _source_files(self, year: int) -> list:
+        """Input CSVs that compile_year_metrics reads for a year."""
+        year_dir = self.data_dir / f"output_dir_{year}" / "analysis_outputs_v10"
+        return [year_dir / "per_particle_summary_rel_v10.csv",
+                year_dir / "connectivity_matrix_normalized_v10.csv"]
+
+    def _sources_hash(self) -> str:
+        """Hash of (path, mtime, size) of every input CSV (missing files included)."""
+        h = hashlib.blake2b(digest_size=16)
         for year in YEARS:
-            print(f"Processing {year}...")
+            for path in self._source_files(year):
+                st = path.stat() if path.exists() else None
+                key = (str(path), st.st_mtime_ns, st.st_size) if st else (str(path),)
+                h.update(repr(key).encode())
+        return h.hexdigest()
+
+    def _load_metrics_cache(self, source_hash: str) -> bool:
+        """Restore year_metrics from the Parquet cache if it matches the inputs."""
+        cache_path = self.data_dir / METRICS_CACHE_NAME
+        if not HAS_PYARROW or not cache_path.exists():
+            return False
+        try:
+            table = pq.read_table(cache_path)
+        except (OSError, pa.ArrowInvalid):
+            return False
+        metadata = table.schema.metadata or {}
+        if metadata.get(b"source_hash", b"").decode() != source_hash:
+            return False
+        df = table.to_pandas()
+        self.year_metrics = {int(year): row for year, row
+                             in df.to_dict(orient='index').items()}
+        return True
+
+    def _save_metrics_cache(self, source_hash: str):
+        """Write year_metrics to the Parquet cache, tagged with the input hash."""
+        if not HAS_PYARROW or not self.year_metrics:
+            return
+        cache_path = self.data_dir / METRICS_CACHE_NAME
+        df = pd.DataFrame.from_dict(self.year_metrics, orient='index')
+        table = pa.Table.from_pandas(df)
+        metadata = {**(table.schema.metadata or {}),
+                    b"source_hash": source_hash.encode()}
+        try:
+            pq.write_table(table.replace_schema_metadata(metadata), cache_path)
+        except OSError as exc:
+            print(f"Warning: Could not write metrics cache {cache_path}: {exc}")
 
-            # Load data
-            particle_df = self.load_particle_data(year)
-            conn_matrix = self.load_connectivity_matrix(year)
+    def compile_year_metrics(self):
+        """
+        Compile metrics for all years.
+
+        Results are cached in data_dir/METRICS_CACHE_NAME and reused while
+        no input CSV has changed (mtime/size hash).
+        """
+        source_hash = self._sources_hash()
+        if self._load_metrics_cache(source_hash):
+            print("Loaded year metrics from cache")
+            return
+
+        # Load data (CSV parsing releases the GIL, so years overlap)
+        def load_year(year):
+            return self.load_particle_data(year), self.load_connectivity_matrix(year)
+
+        max_workers = min(len(YEARS), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            loaded = list(executor.map(load_year, YEARS))
+
+        for year, (particle_data, conn_matrix) in zip(YEARS, loaded):
+            print(f"Processing {year}...")
 
-            if particle_df.empty or conn_matrix.empty:
+            if particle_data is None or conn_matrix.size == 0:
                 continue
 
             # Calculate exposure metrics
-            ty = self.calculate_ty(particle_df)
-            eat = self.calculate_eat(particle_df)
+            ty = self.calculate_ty(particle_data)
+            eat = self.calculate_eat(particle_data)
 
             # Calculate connectivity metrics
             conn_metrics = self.calculate_connectivity_metrics(conn_matrix)
 
-            # Determine year type
-            if year in WARM_YEARS:
-                year_type = "warm"
-            elif year in COLD_YEARS:
-                year_type = "cold"
-            else:
-                year_type = "neutral"
-
             # Store results
             self.year_metrics[year] = {
                 'year': year,
-                'year_type': year_type,
+                'year_type': YEAR_TYPE_MAP.get(year, 'neutral'),
                 'Ty': ty,
                 'EAT': eat,
                 **conn_metrics
             }
 
+        self._save_metrics_cache(source_hash)
+
     def calculate_correlations(self) -> pd.DataFrame:
         """
         Calculate correlations between exposure and response variables.
@@ -279,6 +479,18 @@ class ExposureResponseAnalyzer:
         exposure_vars = ['Ty', 'EAT']
 
         results = []
+        self._fit_cache = {}
+
+        # All pairs from one matrix call when no pair needs its own NaN filter
+        columns = [v for v in exposure_vars + response_vars if v in df.columns]
+        col_idx = {v: i for i, v in enumerate(columns)}
+        use_matrix = (len(columns) > 2 and len(df) >= 3 and
+                      not df[columns].isna().to_numpy().any())
+        if use_matrix:
+            M = df[columns].to_numpy(dtype=float)
+            # Spearman = Pearson on ranks (same t-based p-value as spearmanr)
+            spear_R, spear_P = _pearson_matrix(_rank_columns(M))
+            pear_R, pear_P = _pearson_matrix(M)
 
         for exposure in exposure_vars:
             for response in response_vars:
@@ -287,16 +499,25 @@ class ExposureResponseAnalyzer:
                     valid = df[[exposure, response]].dropna()
 
                     if len(valid) >= 3:  # Need at least 3 points
-                        # Spearman correlation
-                        r_spear, p_spear = spearmanr(valid[exposure], valid[response])
-
-                        # Pearson correlation
-                        r_pear, p_pear = stats.pearsonr(valid[exposure], valid[response])
-
-                        # Theil-Sen regression
-                        slope, intercept, lo_slope, hi_slope = theilslopes(
-                            valid[response], valid[exposure], alpha=0.95
-                        )
+                        if use_matrix:
+                            i, j = col_idx[exposure], col_idx[response]
+                            r_spear, p_spear = spear_R[i, j], spear_P[i, j]
+                            r_pear, p_pear = pear_R[i, j], pear_P[i, j]
+                        else:
+                            # Spearman correlation (ranks shared with other call sites)
+                            ranks = np.column_stack([_ranked(valid[exposure]),
+                                                     _ranked(valid[response])])
+                            R, P = _pearson_matrix(ranks)
+                            r_spear, p_spear = R[0, 1], P[0, 1]
+
+                            # Pearson correlation
+                            r_pear, p_pear = stats.pearsonr(valid[exposure], valid[response])
+
+                        # Theil-Sen regression (reused across repeated calls)
+                        slope, intercept, lo_slope, hi_slope = _theil_sen(
+                            valid[response], valid[exposure])
+                        self._fit_cache[(exposure, response)] = (
+                            slope, intercept, lo_slope, hi_slope, r_spear, p_spear)
 
                         results.append({
                             'Exposure': exposure,
@@ -330,23 +551,21 @@ class ExposureResponseAnalyzer:
         Returns:
             Adjusted p-values
         """
+        p_values = np.asarray(p_values, dtype=np.float64)
         n = len(p_values)
         sorted_idx = np.argsort(p_values)
-        sorted_p = np.array(p_values)[sorted_idx]
 
-        adjusted = np.zeros(n)
-        for i in range(n):
-            adjusted[i] = sorted_p[i] * n / (i + 1)
-
-        # Ensure monotonicity
-        for i in range(n-2, -1, -1):
-            adjusted[i] = min(adjusted[i], adjusted[i+1])
-
-        # Cap at 1
-        adjusted = np.minimum(adjusted, 1.0)
+        # One working array: scale, reverse running minimum and cap in place.
+        # fmin skips the NaN p-values argsort places last (constant series),
+        # so they stay NaN without spreading to the other adjusted values
+        adjusted = p_values[sorted_idx]
+        adjusted *= n
+        adjusted /= np.arange(1, n + 1)
+        np.fmin.accumulate(adjusted[::-1], out=adjusted[::-1])
+        np.minimum(adjusted, 1.0, out=adjusted)
 
         # Restore original order
-        result = np.zeros(n)
+        result = np.empty(n)
         result[sorted_idx] = adjusted
 
         return result
@@ -361,6 +580,12 @@ class ExposureResponseAnalyzer:
         if not self.year_metrics:
             self.compile_year_metrics()
 
+        plt = _configure_plots()
+
+        # Fits come from calculate_correlations (computed once per pair)
+        if not self._fit_cache:
+            self.calculate_correlations()
+
         # Convert to DataFrame
         df = pd.DataFrame.from_dict(self.year_metrics, orient='index')
 
@@ -372,6 +597,13 @@ class ExposureResponseAnalyzer:
             ('EAT', 'local_retention', 'Local retention vs EAT')
         ]
 
+        years = df['year'].to_numpy()
+        year_types = df['year_type'].astype(YEAR_TYPE_DTYPE)
+        # One categorical groupby; absent year types map to an empty frame so
+        # every style still gets its scatter call and legend entry
+        groups = dict(tuple(df.groupby(year_types, observed=True)))
+        empty = df.iloc[:0]
+
         # Create figure
         fig, axes = plt.subplots(2, 2, figsize=(12, 10))
         axes = axes.flatten()
@@ -379,30 +611,26 @@ class ExposureResponseAnalyzer:
         for idx, (x_var, y_var, title) in enumerate(metrics_to_plot):
             ax = axes[idx]
 
-            # Plot by year type
-            for year_type, color, marker, label in [
-                ('cold', COLOR_COLD, MARKER_COLD, 'Cold years'),
-                ('neutral', COLOR_NEUTRAL, MARKER_NEUTRAL, 'Neutral years'),
-                ('warm', COLOR_WARM, MARKER_WARM, 'Warm years')
-            ]:
-                subset = df[df['year_type'] == year_type]
-                ax.scatter(subset[x_var], subset[y_var],
+            # Plot by year type (style order gives the cold/neutral/warm
+            # draw and legend order)
+            for year_type, (color, marker, label) in YEAR_TYPE_STYLE.items():
+                subset = groups.get(year_type, empty)
+                ax.scatter(subset[x_var].to_numpy(), subset[y_var].to_numpy(),
                           color=color, marker=marker, s=100,
                           alpha=0.7, label=label, edgecolors='black', linewidth=1)
 
             # Add year labels
-            for _, row in df.iterrows():
-                ax.annotate(str(row['year'])[-2:],  # Last 2 digits of year
-                          (row[x_var], row[y_var]),
+            for year, xi, yi in zip(years, df[x_var].to_numpy(), df[y_var].to_numpy()):
+                ax.annotate(str(year)[-2:],  # Last 2 digits of year
+                          (xi, yi),
                           fontsize=8, ha='center', va='center')
 
             # Fit regression line (all data)
             valid = df[[x_var, y_var]].dropna()
-            if len(valid) >= 3:
-                # Theil-Sen regression
-                slope, intercept, lo_slope, hi_slope = theilslopes(
-                    valid[y_var], valid[x_var], alpha=0.95
-                )
+            if (x_var, y_var) in self._fit_cache:
+                # Theil-Sen regression and Spearman correlation
+                slope, intercept, lo_slope, hi_slope, r, p = \
+                    self._fit_cache[(x_var, y_var)]
 
                 # Plot regression line
                 x_range = np.linspace(valid[x_var].min(), valid[x_var].max(), 100)
@@ -414,9 +642,6 @@ class ExposureResponseAnalyzer:
                 y_upper = hi_slope * x_range + intercept
                 ax.fill_between(x_range, y_lower, y_upper, alpha=0.2, color='gray')
 
-                # Calculate correlation
-                r, p = spearmanr(valid[x_var], valid[y_var])
-
                 # Add statistics
                 stats_text = f'r = {r:.3f}'
                 if p < 0.001:
@@ -458,58 +683,78 @@ class ExposureResponseAnalyzer:
 
         return fig
 
-    def permutation_test(self, x, y, n_permutations=5000):
+    def permutation_test(self, x, y, n_permutations=5000, batch=None):
         """
         Perform permutation test for correlation significance.
 
+        Both arrays are ranked once and the test statistic is |Spearman r|
+        computed from centered ranks, so each permutation of the pairings is
+        a single dot product (the rank sums of squares are permutation
+        invariant). Uses scipy.stats.permutation_test (SciPy >= 1.8),
+        which batches the resamples and falls back to the exact null for
+        very small samples; otherwise an equivalent NumPy loop is used.
+
         Parameters:
             x, y: Data arrays
             n_permutations: Number of permutations
+            batch: Permutations per vectorized batch (default: all at once)
 
         Returns:
             p-value from permutation test
         """
+        rx = _ranked(x)
+        ry = _ranked(y)
+        rx = rx - rx.mean()
+        ry = ry - ry.mean()
+        denom = np.sqrt((rx @ rx) * (ry @ ry))
+
+        def abs_rank_corr(y_ranks, axis=-1):
+            return np.abs(np.moveaxis(y_ranks, axis, -1) @ rx) / denom
+
+        if hasattr(stats, "permutation_test"):
+            res = stats.permutation_test(
+                (ry,), abs_rank_corr, permutation_type='pairings',
+                vectorized=True, n_resamples=n_permutations, batch=batch,
+                alternative='greater', random_state=RANDOM_SEED)
+            return res.pvalue
+
         # Observed correlation
-        obs_r, _ = spearmanr(x, y)
+        obs_r = abs_rank_corr(ry)
 
         # Permutation correlations
-        perm_r = []
         rng = np.random.default_rng(RANDOM_SEED)
+        batch = n_permutations if batch is None else max(1, int(batch))
+        n_extreme = 0
 
-        for _ in range(n_permutations):
-            y_perm = rng.permutation(y)
-            r_perm, _ = spearmanr(x, y_perm)
-            perm_r.append(r_perm)
-
-        perm_r = np.array(perm_r)
+        for start in range(0, n_permutations, batch):
+            size = min(batch, n_permutations - start)
+            y_perm = np.tile(ry, (size, 1))
+            rng.permuted(y_perm, axis=1, out=y_perm)
+            n_extreme += np.count_nonzero(abs_rank_corr(y_perm) >= obs_r)
 
         # Two-tailed p-value
-        p_value = np.mean(np.abs(perm_r) >= np.abs(obs_r))
+        p_value = n_extreme / n_permutations
 
         return p_value
 
-    def generate_summary_table(self, output_path: Path = None):
+    def generate_summary_table(self, output_path: Path = None,
+                               corr_df: pd.DataFrame = None):
         """
         Generate summary table of exposure-response relationships.
 
         Parameters:
             output_path: Path to save CSV
+            corr_df: Precomputed calculate_correlations() result (optional)
         """
         # Calculate correlations
-        corr_df = self.calculate_correlations()
-
-        # Add significance markers
-        def sig_marker(p):
-            if p < 0.001:
-                return '***'
-            elif p < 0.01:
-                return '**'
-            elif p < 0.05:
-                return '*'
-            else:
-                return 'ns'
+        if corr_df is None:
+            corr_df = self.calculate_correlations()
 
-        corr_df['Significance'] = corr_df['Spearman_p_adj'].apply(sig_marker)
+        # Add significance markers (NaN p-values fall through to 'ns')
+        p_adj = corr_df['Spearman_p_adj'].to_numpy()
+        corr_df['Significance'] = np.select(
+            [p_adj < 0.001, p_adj < 0.01, p_adj < 0.05], ['***', '**', '*'],
+            default='ns')
 
         # Format for publication
         summary = corr_df[['Exposure', 'Response', 'N',
@@ -529,6 +774,9 @@ class ExposureResponseAnalyzer:
 
 def main():
     """Main analysis workflow."""
+    import matplotlib
+    matplotlib.use("Agg")  # Figures are only saved; skip GUI backend setup
+
     # Set up paths
     data_dir = Path("./data")  # Update with actual path
     output_dir = Path("./figures")
@@ -541,6 +789,9 @@ def main():
     print("Compiling year metrics...")
     analyzer.compile_year_metrics()
 
+    # Correlations and fits for every exposure-response pair (computed once)
+    corr_df = analyzer.calculate_correlations()
+
     # Generate exposure-response figure
     print("Generating exposure-response curves...")
     fig = analyzer.plot_exposure_response_curves(
@@ -550,7 +801,7 @@ def main():
     # Generate summary table
     print("Generating summary statistics...")
     summary = analyzer.generate_summary_table(
-        output_dir / "exposure_response_statistics.csv"
+        output_dir / "exposure_response_statistics.csv", corr_df
     )
 
     print("\nExposure-Response Summary:")
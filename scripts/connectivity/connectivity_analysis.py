@@ -14,14 +14,26 @@ Main components:
 - Network metrics (source strength, sink strength, leakage rate)
 """
 
+import functools
+import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.gridspec import GridSpec
-from matplotlib.patches import Patch
-from scipy import stats
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import pyarrow.csv as pv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 warnings.filterwarnings('ignore')
 
@@ -31,6 +43,20 @@ MPA_ORDER = ["MNR-7", "MNR-8-N", "MNR-8-S", "SMPA-2", "SMPA-4"]
 DEST_OUTSIDE = "OUTSIDE"
 DEST_UNSETTLED = "UNSETTLED"
 NA_ORIGIN = "NA_ORIGIN"
+# Fixed destination layout for aligned matrices (MPAs, then outside sinks)
+DEST_COLUMNS = MPA_ORDER + [DEST_UNSETTLED, DEST_OUTSIDE]
+NETWORK_METRICS = ['source_strength', 'sink_strength', 'leakage', 'self_recruitment']
+
+# Per-particle columns read by load_particle_data (others are skipped on read)
+PARTICLE_USECOLS = ["release_zone", "settle_zone", "temp_mean_egg", "temp_mean",
+                    "distance_km"]
+PARTICLE_DTYPES = {
+    "release_zone": "category",
+    "settle_zone": "category",
+    "temp_mean_egg": "float32",
+    "temp_mean": "float32",
+    "distance_km": "float32",
+}
 
 # Temperature-based year classification (based on egg-stage temperature)
 WARM_YEARS = [2017, 2018, 2022]    # Egg temperature > 75th percentile
@@ -43,18 +69,256 @@ CONFIDENCE_LEVEL = 0.95
 INCLUDE_UNSETTLED_IN_LEAKAGE = False
 EXCLUDE_SELF_IN_SS = True
 
+# Destination columns counted as leakage out of the MPA network
+LEAKAGE_COLUMNS = np.array(
+    [DEST_COLUMNS.index(DEST_OUTSIDE)] +
+    ([DEST_COLUMNS.index(DEST_UNSETTLED)] if INCLUDE_UNSETTLED_IN_LEAKAGE else []))
+
 # Visualization colors
 COLOR_COLD = "#3B4CC0"   # Blue for cold years
 COLOR_WARM = "#B40426"   # Red for warm years
 COLOR_NEUTRAL = "#888888" # Gray for neutral years
 
 
+def _file_stamp(file_path: Path):
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = file_path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# CSV reads are memoized on (path, stamp), so an edited file is re-read;
+# loaders hand out copies so callers cannot mutate the cached frame
+@functools.lru_cache(maxsize=64)
+def _read_connectivity_csv(file_path: Path, stamp: tuple) -> pd.DataFrame:
+    """
+    Cleaned connectivity matrix, via an .npz sidecar of the CSV when fresh.
+
+    The sidecar holds the cleaned values and labels, so later runs skip
+    text parsing; it is rewritten whenever the CSV is newer.
+    """
+    cache_path = file_path.with_suffix(".npz")
+    if cache_path.exists() and cache_path.stat().st_mtime_ns >= stamp[0]:
+        with np.load(cache_path, allow_pickle=False) as cached:
+            df = pd.DataFrame(cached["data"], index=cached["rows"].tolist(),
+                              columns=cached["cols"].tolist())
+            df.index.name = str(cached["index_name"]) or None
+        return df
+
+    df = pd.read_csv(file_path, index_col=0, encoding="utf-8-sig")
+
+    # Clean and reorder
+    if NA_ORIGIN in df.index:
+        df = df.drop(index=[NA_ORIGIN])
+
+    rows = [r for r in MPA_ORDER if r in df.index]
+    cols = [c for c in MPA_ORDER if c in df.columns]
+
+    # Include outside destinations if present
+    for extra in [DEST_UNSETTLED, DEST_OUTSIDE]:
+        if extra in df.columns:
+            cols.append(extra)
+
+    df = df.reindex(index=rows, columns=cols).fillna(0.0)
+
+    try:
+        np.savez(cache_path, data=df.to_numpy(dtype=float),
+                 rows=np.array(rows, dtype=str), cols=np.array(cols, dtype=str),
+                 index_name=np.array(df.index.name or ""))
+    except OSError as exc:
+        print(f"Warning: Could not write cache {cache_path}: {exc}")
+
+    return df
+
+
+def _particle_plan(file_path: Path, columns: tuple) -> tuple:
+    """
+    How to read a particle CSV: (usecols, dtype, Parquet copy or None).
+
+    A Parquet copy (see _convert_particles_to_parquet) is used when it is
+    at least as new as the CSV. usecols keep the file's column order.
+    """
+    parquet_path = file_path.with_suffix(".parquet")
+    if (HAS_PYARROW and parquet_path.exists() and
+            parquet_path.stat().st_mtime >= file_path.stat().st_mtime):
+        header = pq.read_schema(parquet_path).names
+    else:
+        parquet_path = None
+        header = pd.read_csv(file_path, encoding="utf-8-sig", nrows=0).columns
+    wanted = set(columns)
+    usecols = [c for c in header if c in wanted]
+    dtype = {c: t for c, t in PARTICLE_DTYPES.items() if c in usecols}
+    return usecols, dtype, parquet_path
+
+
+@functools.lru_cache(maxsize=4)  # Particle tables are large; keep a few
+def _read_particle_csv(file_path: Path, stamp: tuple, columns: tuple) -> pd.DataFrame:
+    usecols, dtype, parquet_path = _particle_plan(file_path, columns)
+    if parquet_path is not None:
+        return pd.read_parquet(parquet_path, columns=usecols).astype(dtype)
+    return pd.read_csv(file_path, encoding="utf-8-sig", usecols=usecols, dtype=dtype)
+
+
+def _iter_particle_chunks(file_path: Path, columns: tuple, chunksize: int):
+    """Yield a particle table as DataFrames of at most chunksize rows."""
+    usecols, dtype, parquet_path = _particle_plan(file_path, columns)
+    if parquet_path is not None:
+        parquet_file = pq.ParquetFile(parquet_path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=usecols):
+            yield batch.to_pandas().astype(dtype)
+        return
+    yield from pd.read_csv(file_path, encoding="utf-8-sig", usecols=usecols,
+                           dtype=dtype, chunksize=chunksize)
+
+
+def _align_matrix(conn_matrix) -> np.ndarray:
+    """
+    Connectivity matrix as a (MPA_ORDER x DEST_COLUMNS) float array.
+
+    Rows/columns absent from the input are NaN so they can be told apart
+    from genuine zero connectivity.
+    """
+    if isinstance(conn_matrix, np.ndarray):
+        return conn_matrix
+
+    # Positions of the fixed labels in this frame (-1 where absent)
+    rows = conn_matrix.index.get_indexer(MPA_ORDER)
+    cols = conn_matrix.columns.get_indexer(DEST_COLUMNS)
+    row_ok, col_ok = rows >= 0, cols >= 0
+
+    aligned = np.full((len(MPA_ORDER), len(DEST_COLUMNS)), np.nan)
+    values = conn_matrix.to_numpy(dtype=float)
+    aligned[np.ix_(row_ok, col_ok)] = values[np.ix_(rows[row_ok], cols[col_ok])]
+    return aligned
+
+
+def _network_arrays(M: np.ndarray) -> tuple:
+    """
+    Per-MPA network metrics of aligned matrices (see _align_matrix).
+
+    Parameters:
+        M: Aligned matrix, or a stack of them with any leading batch axes
+
+    Returns:
+        (row_ok, col_ok, source, sink, leakage, self_recruitment), each of
+        shape M.shape[:-2] + (len(MPA_ORDER),); the masks flag
+        origins/destinations present
+    """
+    k = len(MPA_ORDER)
+    absent = np.isnan(M)
+    row_ok = ~absent.all(axis=-1)
+    col_ok = ~absent[..., :k].all(axis=-2)
+    filled = np.where(absent, 0.0, M)
+    mpa = filled[..., :k]
+    own = np.diagonal(mpa, axis1=-2, axis2=-1)
+
+    # Connections to/from other MPAs (exclude self and outside)
+    source = mpa.sum(axis=-1) - own
+    sink = mpa.sum(axis=-2) - own
+
+    # Particles leaving the MPA network
+    leakage = filled[..., LEAKAGE_COLUMNS].sum(axis=-1)
+
+    self_recruitment = np.diagonal(M[..., :k], axis1=-2, axis2=-1)
+    return row_ok, col_ok, source, sink, leakage, self_recruitment
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _bootstrap_kernel(stacked, idx, leak_cols, out):
+        """
+        Network metrics of every resampled mean matrix, written into out.
+
+        Same result as _network_arrays on np.nanmean(stacked[idx], axis=1)
+        with absent MPAs zeroed, without materializing the resampled stack.
+        out has shape (len(NETWORK_METRICS), n_bootstrap, n_mpa).
+        """
+        n_boot, n_draw = idx.shape
+        n_row, n_col = stacked.shape[1], stacked.shape[2]
+        k = out.shape[2]
+        for b in prange(n_boot):
+            # Mean over the drawn years, skipping years missing a cell
+            avg = np.empty((n_row, n_col))
+            for r in range(n_row):
+                for c in range(n_col):
+                    total = 0.0
+                    count = 0
+                    for d in range(n_draw):
+                        v = stacked[idx[b, d], r, c]
+                        if not np.isnan(v):
+                            total += v
+                            count += 1
+                    avg[r, c] = total / count if count > 0 else np.nan
+
+            for i in range(k):
+                row_ok = False
+                for c in range(n_col):
+                    if not np.isnan(avg[i, c]):
+                        row_ok = True
+                col_ok = False
+                for r in range(n_row):
+                    if not np.isnan(avg[r, i]):
+                        col_ok = True
+
+                source = 0.0
+                sink = 0.0
+                for j in range(k):
+                    if j != i:
+                        if not np.isnan(avg[i, j]):
+                            source += avg[i, j]
+                        if not np.isnan(avg[j, i]):
+                            sink += avg[j, i]
+                leakage = 0.0
+                for c in leak_cols:
+                    if not np.isnan(avg[i, c]):
+                        leakage += avg[i, c]
+
+                out[0, b, i] = source if row_ok else 0.0
+                out[1, b, i] = sink if col_ok else 0.0
+                out[2, b, i] = leakage if row_ok else 0.0
+                out[3, b, i] = avg[i, i] if row_ok and col_ok else 0.0
+
+
+def _bootstrap_metrics(stacked: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """
+    Network metrics for each resample of years.
+
+    Parameters:
+        stacked: Aligned matrices, shape (n_years, n_mpa, n_dest); any float
+            dtype, reduced in float64
+        idx: Drawn year indices, shape (n_bootstrap, n_draws)
+
+    Returns:
+        Array of shape (len(NETWORK_METRICS), n_bootstrap, n_mpa); MPAs
+        absent from a resample count as 0
+    """
+    out = np.zeros((len(NETWORK_METRICS), len(idx), len(MPA_ORDER)))
+    if HAS_NUMBA:
+        _bootstrap_kernel(stacked, idx, LEAKAGE_COLUMNS, out)
+        return out
+
+    # Batched NumPy path: average each draw (NaN marks absent MPAs)
+    avg_matrices = np.nanmean(stacked[idx], axis=1, dtype=np.float64)
+    row_ok, col_ok, source, sink, leakage, self_r = _network_arrays(avg_matrices)
+    values = [(source, row_ok), (sink, col_ok), (leakage, row_ok),
+              (self_r, row_ok & col_ok)]
+    for m, (v, present) in enumerate(values):
+        np.copyto(out[m], v, where=present)
+    return out
+
+
 class ConnectivityAnalyzer:
     """Analyze connectivity patterns from particle tracking results."""
 
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, seed=None):
         self.data_dir = data_dir
         self.years = list(range(2014, 2023))
+        # Shared resampling generator (seed for reproducible bootstraps)
+        self.rng = np.random.default_rng(seed)
+        # Memoized compare_temperature_regimes result (figure and export share it)
+        self._comparisons = None
 
     def load_connectivity_matrix(self, year: int, normalized: bool = True) -> pd.DataFrame:
         """
@@ -74,84 +338,91 @@ class ConnectivityAnalyzer:
 
         file_path = self.data_dir / f"output_dir_{year}" / "analysis_outputs_v10" / filename
 
-        if not file_path.exists():
+        stamp = _file_stamp(file_path)
+        if stamp is None:
             raise FileNotFoundError(f"Connectivity matrix not found: {file_path}")
 
-        df = pd.read_csv(file_path, index_col=0, encoding="utf-8-sig")
+        return _read_connectivity_csv(file_path, stamp).copy()
 
-        # Clean and reorder
-        if NA_ORIGIN in df.index:
-            df = df.drop(index=[NA_ORIGIN])
+    def load_particle_data(self, year: int, columns=None, chunksize: int = None):
+        """
+        Load particle-level data including temperature and distance metrics.
 
-        rows = [r for r in MPA_ORDER if r in df.index]
-        cols = [c for c in MPA_ORDER if c in df.columns]
+        Parameters:
+            year: Year to load
+            columns: Columns to read (default PARTICLE_USECOLS; ones missing
+                from the file are skipped)
+            chunksize: If given, return an iterator of DataFrames with at most
+                this many rows instead of the whole table (not cached)
 
-        # Include outside destinations if present
-        for extra in [DEST_UNSETTLED, DEST_OUTSIDE]:
-            if extra in df.columns:
-                cols.append(extra)
+        Returns:
+            Particle DataFrame, or an iterator of DataFrames when chunked
+        """
+        file_path = self._particle_path(year)
 
-        df = df.reindex(index=rows, columns=cols).fillna(0.0)
-        return df
+        stamp = _file_stamp(file_path)
+        if stamp is None:
+            raise FileNotFoundError(f"Particle data not found: {file_path}")
 
-    def load_particle_data(self, year: int) -> pd.DataFrame:
-        """Load particle-level data including temperature and distance metrics."""
-        file_path = self.data_dir / f"output_dir_{year}" / "analysis_outputs_v10" / "particle_data.csv"
+        columns = tuple(PARTICLE_USECOLS if columns is None else columns)
+        if chunksize is not None:
+            return _iter_particle_chunks(file_path, columns, chunksize)
+        return _read_particle_csv(file_path, stamp, columns).copy()
 
+    def _particle_path(self, year: int) -> Path:
+        return self.data_dir / f"output_dir_{year}" / "analysis_outputs_v10" / "particle_data.csv"
+
+    def _convert_particles_to_parquet(self, year: int) -> Path:
+        """
+        Write particle_data.parquet next to the year's CSV (all columns).
+
+        The CSV is streamed in record batches, so the table never has to fit
+        in memory; later loads read only the requested columns from it.
+
+        Returns:
+            Path of the Parquet file
+        """
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required to convert particle data to Parquet")
+
+        file_path = self._particle_path(year)
         if not file_path.exists():
             raise FileNotFoundError(f"Particle data not found: {file_path}")
 
-        return pd.read_csv(file_path, encoding="utf-8-sig")
+        parquet_path = file_path.with_suffix(".parquet")
+        reader = pv.open_csv(file_path)
+        with pq.ParquetWriter(parquet_path, reader.schema, compression="snappy") as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+        return parquet_path
+
+    def clear_cache(self):
+        """Drop all memoized CSV reads and the regime comparison."""
+        _read_connectivity_csv.cache_clear()
+        _read_particle_csv.cache_clear()
+        self._comparisons = None
 
     def calculate_network_metrics(self, conn_matrix: pd.DataFrame) -> dict:
         """
         Calculate network-level connectivity metrics.
 
         Parameters:
-            conn_matrix: Normalized connectivity matrix
+            conn_matrix: Normalized connectivity matrix (DataFrame, or an
+                array already aligned by _align_matrix)
 
         Returns:
             Dictionary of metrics
         """
         metrics = {}
 
-        # Source strength (outgoing connectivity)
-        source_strength = {}
-        for origin in MPA_ORDER:
-            if origin not in conn_matrix.index:
-                continue
-            row = conn_matrix.loc[origin]
-            # Sum connections to other MPAs (exclude self and outside)
-            other_mpas = [c for c in MPA_ORDER if c != origin and c in row.index]
-            source_strength[origin] = row[other_mpas].sum()
-
-        # Sink strength (incoming connectivity)
-        sink_strength = {}
-        for dest in MPA_ORDER:
-            if dest not in conn_matrix.columns:
-                continue
-            # Sum connections from other MPAs
-            other_mpas = [r for r in MPA_ORDER if r != dest and r in conn_matrix.index]
-            sink_strength[dest] = conn_matrix.loc[other_mpas, dest].sum()
-
-        # Leakage rate (particles leaving MPA network)
-        leakage = {}
-        for origin in MPA_ORDER:
-            if origin not in conn_matrix.index:
-                continue
-            row = conn_matrix.loc[origin]
-            outside = 0.0
-            if DEST_OUTSIDE in row.index:
-                outside += row[DEST_OUTSIDE]
-            if INCLUDE_UNSETTLED_IN_LEAKAGE and DEST_UNSETTLED in row.index:
-                outside += row[DEST_UNSETTLED]
-            leakage[origin] = outside
-
-        # Self-recruitment rate
-        self_recruitment = {}
-        for mpa in MPA_ORDER:
-            if mpa in conn_matrix.index and mpa in conn_matrix.columns:
-                self_recruitment[mpa] = conn_matrix.loc[mpa, mpa]
+        row_ok, col_ok, source, sink, leakage, self_r = _network_arrays(
+            _align_matrix(conn_matrix))
+
+        source_strength = {m: source[i] for i, m in enumerate(MPA_ORDER) if row_ok[i]}
+        sink_strength = {m: sink[i] for i, m in enumerate(MPA_ORDER) if col_ok[i]}
+        leakage = {m: leakage[i] for i, m in enumerate(MPA_ORDER) if row_ok[i]}
+        self_recruitment = {m: self_r[i] for i, m in enumerate(MPA_ORDER)
+                            if row_ok[i] and col_ok[i]}
 
         metrics['source_strength'] = source_strength
         metrics['sink_strength'] = sink_strength
@@ -160,71 +431,95 @@ class ConnectivityAnalyzer:
 
         return metrics
 
-    def bootstrap_connectivity(self, years: list, n_bootstrap: int = 1000) -> dict:
+    def _load_stack(self, years: list) -> np.ndarray:
+        """Aligned normalized matrices of the available years, stacked."""
+        def load_year(year):
+            try:
+                return _align_matrix(self.load_connectivity_matrix(year, normalized=True))
+            except FileNotFoundError:
+                return None
+
+        # CSV parsing releases the GIL, so years load concurrently
+        max_workers = min(len(years), os.cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            loaded = list(executor.map(load_year, years))
+
+        arrays = []
+        for year, array in zip(years, loaded):
+            if array is None:
+                print(f"Warning: No data for year {year}")
+                continue
+            arrays.append(array)
+
+        if not arrays:
+            raise ValueError("No valid connectivity matrices found")
+
+        # Probabilities with a few significant digits: store in float32 to
+        # halve the resampling gather traffic (reductions accumulate in float64)
+        return np.ascontiguousarray(np.stack(arrays), dtype=np.float32)
+
+    def bootstrap_connectivity(self, years: list, n_bootstrap: int = 1000,
+                               seed=None) -> dict:
         """
         Bootstrap connectivity metrics across years.
 
         Parameters:
             years: List of years to include
             n_bootstrap: Number of bootstrap iterations
+            seed: Seed for this call's generator (None uses self.rng)
 
         Returns:
             Dictionary with bootstrapped statistics
         """
-        # Load all connectivity matrices
-        matrices = []
-        for year in years:
-            try:
-                conn = self.load_connectivity_matrix(year, normalized=True)
-                matrices.append(conn)
-            except FileNotFoundError:
-                print(f"Warning: No data for year {year}")
-                continue
-
-        if not matrices:
-            raise ValueError("No valid connectivity matrices found")
-
-        # Bootstrap sampling
-        bootstrap_results = []
-        for _ in range(n_bootstrap):
-            # Sample with replacement
-            sampled_matrices = np.random.choice(matrices, size=len(matrices), replace=True)
-            # Average the sampled matrices
-            avg_matrix = pd.concat(sampled_matrices).groupby(level=0).mean()
-            # Calculate metrics
-            metrics = self.calculate_network_metrics(avg_matrix)
-            bootstrap_results.append(metrics)
-
-        # Aggregate bootstrap results
+        stacked = self._load_stack(years)  # (n_years, n_mpa, n_dest)
+        n_years = len(stacked)
+        rng = self.rng if seed is None else np.random.default_rng(seed)
+
+        # All resamples at once: draw years with replacement, then reduce
+        # each draw to per-MPA metrics
+        idx = rng.integers(0, n_years, (n_bootstrap, n_years))
+        values = _bootstrap_metrics(stacked, idx)
+
+        # Aggregate bootstrap results: each statistic in one call across
+        # all metrics and MPAs, shape (n_metrics, n_mpa, 4)
+        ci_low, ci_high = np.quantile(values, [0.025, 0.975], axis=1)
+        summary = np.stack([values.mean(axis=1), values.std(axis=1),
+                            ci_low, ci_high], axis=-1)
+
+        stat_keys = ('mean', 'std', 'ci_low', 'ci_high')
         aggregated = {
-            'source_strength': {},
-            'sink_strength': {},
-            'leakage': {},
-            'self_recruitment': {}
+            metric_type: {mpa: dict(zip(stat_keys, row))
+                          for mpa, row in zip(MPA_ORDER, per_mpa)}
+            for metric_type, per_mpa in zip(NETWORK_METRICS, summary)
         }
 
-        for metric_type in aggregated.keys():
-            for mpa in MPA_ORDER:
-                values = [r[metric_type].get(mpa, 0) for r in bootstrap_results]
-                if values:
-                    aggregated[metric_type][mpa] = {
-                        'mean': np.mean(values),
-                        'std': np.std(values),
-                        'ci_low': np.percentile(values, 2.5),
-                        'ci_high': np.percentile(values, 97.5)
-                    }
-
         return aggregated
 
-    def compare_temperature_regimes(self):
-        """Compare connectivity patterns between warm and cold years."""
-        # Load data for each temperature regime
+    def compare_temperature_regimes(self, refresh: bool = False):
+        """
+        Compare connectivity patterns between warm and cold years.
+
+        The result is memoized on the analyzer, so the figure and the CSV
+        export report the same bootstrap draws.
+
+        Parameters:
+            refresh: If True, recompute instead of reusing the memoized result
+
+        Returns:
+            Nested dict metric -> MPA -> warm/cold/difference/relative_change
+        """
+        if self._comparisons is not None and not refresh:
+            return self._comparisons
+
+        # Bootstrap each temperature regime. Years load concurrently inside
+        # bootstrap_connectivity; the resampling itself is milliseconds and
+        # stays on this thread so the shared generator draws in a fixed order
         warm_metrics = self.bootstrap_connectivity(WARM_YEARS, N_BOOTSTRAP)
         cold_metrics = self.bootstrap_connectivity(COLD_YEARS, N_BOOTSTRAP)
 
         # Statistical comparison
         comparisons = {}
-        for metric_type in ['source_strength', 'sink_strength', 'leakage', 'self_recruitment']:
+        for metric_type in NETWORK_METRICS:
             comparisons[metric_type] = {}
             for mpa in MPA_ORDER:
                 if mpa in warm_metrics[metric_type] and mpa in cold_metrics[metric_type]:
@@ -238,11 +533,49 @@ class ConnectivityAnalyzer:
                         'relative_change': diff / cold_val if cold_val > 0 else 0
                     }
 
+        self._comparisons = comparisons
         return comparisons
 
 
+def _mean_matrix(matrices: list) -> np.ndarray:
+    """Element-wise mean of connectivity matrices, aligned (see _align_matrix)."""
+    return np.nanmean(np.stack([_align_matrix(m) for m in matrices]), axis=0)
+
+
+def _annotate_heatmap(ax, values: np.ndarray, threshold: float = 0.01):
+    """Label heatmap cells above threshold (only those cells get a Text)."""
+    for i, j in np.argwhere(values > threshold):
+        val = values[i, j]
+        ax.text(j, i, f'{val:.2f}' if val < 0.1 else f'{val:.1%}',
+                ha="center", va="center", color="white" if val > 0.3 else "black")
+
+
+def _regime_values(comparisons: dict, metric_type: str) -> np.ndarray:
+    """(warm, cold) means of a compared metric, in MPA_ORDER (shape (2, k))."""
+    per_mpa = comparisons[metric_type]
+    return np.array([[per_mpa[mpa][regime] for mpa in MPA_ORDER]
+                     for regime in ('warm', 'cold')])
+
+
+def _plot_bars(ax, warm_vals, cold_vals, ylabel: str, title: str):
+    """Grouped warm/cold bars per MPA."""
+    x = np.arange(len(MPA_ORDER))
+    width = 0.35
+    ax.bar(x - width/2, warm_vals, width, label='Warm', color=COLOR_WARM)
+    ax.bar(x + width/2, cold_vals, width, label='Cold', color=COLOR_COLD)
+    ax.set_xlabel("MPA")
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.set_xticks(x)
+    ax.set_xticklabels(MPA_ORDER, rotation=45)
+    ax.legend()
+
+
 def plot_connectivity_comparison(analyzer: ConnectivityAnalyzer):
     """Create comprehensive connectivity comparison figure."""
+    # Plotting imports are deferred so metric-only runs skip matplotlib
+    import matplotlib.pyplot as plt
+    from matplotlib.gridspec import GridSpec
 
     fig = plt.figure(figsize=(16, 12))
     gs = GridSpec(3, 3, hspace=0.3, wspace=0.25)
@@ -251,12 +584,14 @@ def plot_connectivity_comparison(analyzer: ConnectivityAnalyzer):
     warm_matrices = [analyzer.load_connectivity_matrix(y) for y in WARM_YEARS]
     cold_matrices = [analyzer.load_connectivity_matrix(y) for y in COLD_YEARS]
 
-    warm_avg = pd.concat(warm_matrices).groupby(level=0).mean()
-    cold_avg = pd.concat(cold_matrices).groupby(level=0).mean()
+    # Regime means over aligned arrays, MPA-to-MPA block only
+    k = len(MPA_ORDER)
+    warm_avg = _mean_matrix(warm_matrices)[:, :k]
+    cold_avg = _mean_matrix(cold_matrices)[:, :k]
 
     # Panel A: Warm years connectivity matrix
     ax1 = fig.add_subplot(gs[0, 0])
-    im1 = ax1.imshow(warm_avg.loc[MPA_ORDER, MPA_ORDER].values,
+    im1 = ax1.imshow(warm_avg,
                      cmap='Reds', vmin=0, vmax=0.5, aspect='auto')
     ax1.set_xticks(range(len(MPA_ORDER)))
     ax1.set_yticks(range(len(MPA_ORDER)))
@@ -268,16 +603,11 @@ def plot_connectivity_comparison(analyzer: ConnectivityAnalyzer):
     plt.colorbar(im1, ax=ax1, fraction=0.046, pad=0.04)
 
     # Add values to cells
-    for i in range(len(MPA_ORDER)):
-        for j in range(len(MPA_ORDER)):
-            val = warm_avg.iloc[i, j]
-            if val > 0.01:
-                text = ax1.text(j, i, f'{val:.2f}' if val < 0.1 else f'{val:.1%}',
-                              ha="center", va="center", color="white" if val > 0.3 else "black")
+    _annotate_heatmap(ax1, warm_avg)
 
     # Panel B: Cold years connectivity matrix
     ax2 = fig.add_subplot(gs[0, 1])
-    im2 = ax2.imshow(cold_avg.loc[MPA_ORDER, MPA_ORDER].values,
+    im2 = ax2.imshow(cold_avg,
                      cmap='Blues', vmin=0, vmax=0.5, aspect='auto')
     ax2.set_xticks(range(len(MPA_ORDER)))
     ax2.set_yticks(range(len(MPA_ORDER)))
@@ -289,17 +619,12 @@ def plot_connectivity_comparison(analyzer: ConnectivityAnalyzer):
     plt.colorbar(im2, ax=ax2, fraction=0.046, pad=0.04)
 
     # Add values to cells
-    for i in range(len(MPA_ORDER)):
-        for j in range(len(MPA_ORDER)):
-            val = cold_avg.iloc[i, j]
-            if val > 0.01:
-                text = ax2.text(j, i, f'{val:.2f}' if val < 0.1 else f'{val:.1%}',
-                              ha="center", va="center", color="white" if val > 0.3 else "black")
+    _annotate_heatmap(ax2, cold_avg)
 
     # Panel C: Difference matrix
     ax3 = fig.add_subplot(gs[0, 2])
-    diff = warm_avg.loc[MPA_ORDER, MPA_ORDER] - cold_avg.loc[MPA_ORDER, MPA_ORDER]
-    im3 = ax3.imshow(diff.values, cmap='RdBu_r', vmin=-0.1, vmax=0.1, aspect='auto')
+    diff = warm_avg - cold_avg
+    im3 = ax3.imshow(diff, cmap='RdBu_r', vmin=-0.1, vmax=0.1, aspect='auto')
     ax3.set_xticks(range(len(MPA_ORDER)))
     ax3.set_yticks(range(len(MPA_ORDER)))
     ax3.set_xticklabels(MPA_ORDER, rotation=45, ha='right')
@@ -312,59 +637,15 @@ def plot_connectivity_comparison(analyzer: ConnectivityAnalyzer):
     # Panel D-F: Network metrics
     comparisons = analyzer.compare_temperature_regimes()
 
-    # Source strength
-    ax4 = fig.add_subplot(gs[1, 0])
-    x = np.arange(len(MPA_ORDER))
-    width = 0.35
-    warm_vals = [comparisons['source_strength'][mpa]['warm'] for mpa in MPA_ORDER]
-    cold_vals = [comparisons['source_strength'][mpa]['cold'] for mpa in MPA_ORDER]
-    ax4.bar(x - width/2, warm_vals, width, label='Warm', color=COLOR_WARM)
-    ax4.bar(x + width/2, cold_vals, width, label='Cold', color=COLOR_COLD)
-    ax4.set_xlabel("MPA")
-    ax4.set_ylabel("Source strength")
-    ax4.set_title("Source strength comparison")
-    ax4.set_xticks(x)
-    ax4.set_xticklabels(MPA_ORDER, rotation=45)
-    ax4.legend()
-
-    # Sink strength
-    ax5 = fig.add_subplot(gs[1, 1])
-    warm_vals = [comparisons['sink_strength'][mpa]['warm'] for mpa in MPA_ORDER]
-    cold_vals = [comparisons['sink_strength'][mpa]['cold'] for mpa in MPA_ORDER]
-    ax5.bar(x - width/2, warm_vals, width, label='Warm', color=COLOR_WARM)
-    ax5.bar(x + width/2, cold_vals, width, label='Cold', color=COLOR_COLD)
-    ax5.set_xlabel("MPA")
-    ax5.set_ylabel("Sink strength")
-    ax5.set_title("Sink strength comparison")
-    ax5.set_xticks(x)
-    ax5.set_xticklabels(MPA_ORDER, rotation=45)
-    ax5.legend()
-
-    # Leakage rate
-    ax6 = fig.add_subplot(gs[1, 2])
-    warm_vals = [comparisons['leakage'][mpa]['warm'] for mpa in MPA_ORDER]
-    cold_vals = [comparisons['leakage'][mpa]['cold'] for mpa in MPA_ORDER]
-    ax6.bar(x - width/2, warm_vals, width, label='Warm', color=COLOR_WARM)
-    ax6.bar(x + width/2, cold_vals, width, label='Cold', color=COLOR_COLD)
-    ax6.set_xlabel("MPA")
-    ax6.set_ylabel("Leakage rate")
-    ax6.set_title("Leakage rate comparison")
-    ax6.set_xticks(x)
-    ax6.set_xticklabels(MPA_ORDER, rotation=45)
-    ax6.legend()
-
-    # Self-recruitment
-    ax7 = fig.add_subplot(gs[2, 0:2])
-    warm_vals = [comparisons['self_recruitment'][mpa]['warm'] for mpa in MPA_ORDER]
-    cold_vals = [comparisons['self_recruitment'][mpa]['cold'] for mpa in MPA_ORDER]
-    ax7.bar(x - width/2, warm_vals, width, label='Warm', color=COLOR_WARM)
-    ax7.bar(x + width/2, cold_vals, width, label='Cold', color=COLOR_COLD)
-    ax7.set_xlabel("MPA")
-    ax7.set_ylabel("Self-recruitment rate")
-    ax7.set_title("Self-recruitment comparison")
-    ax7.set_xticks(x)
-    ax7.set_xticklabels(MPA_ORDER, rotation=45)
-    ax7.legend()
+    panels = [
+        (gs[1, 0], 'source_strength', "Source strength", "Source strength comparison"),
+        (gs[1, 1], 'sink_strength', "Sink strength", "Sink strength comparison"),
+        (gs[1, 2], 'leakage', "Leakage rate", "Leakage rate comparison"),
+        (gs[2, 0:2], 'self_recruitment', "Self-recruitment rate", "Self-recruitment comparison"),
+    ]
+    for spec, metric_type, ylabel, title in panels:
+        warm_vals, cold_vals = _regime_values(comparisons, metric_type)
+        _plot_bars(fig.add_subplot(spec), warm_vals, cold_vals, ylabel, title)
 
     plt.suptitle("Temperature-driven connectivity patterns in Bohai Sea MPAs",
                  fontsize=14, fontweight='bold', y=0.98)
@@ -373,13 +654,26 @@ def plot_connectivity_comparison(analyzer: ConnectivityAnalyzer):
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hard clam MPA connectivity analysis")
+    parser.add_argument("--no-plot", action="store_true",
+                        help="Only export the comparison CSVs (skips matplotlib)")
+    args = parser.parse_args()
+
     # Example usage
     data_dir = Path("./data")  # Update with actual data path
     analyzer = ConnectivityAnalyzer(data_dir)
 
     # Generate comparison figure
-    fig = plot_connectivity_comparison(analyzer)
-    fig.savefig("connectivity_comparison.png", dpi=300, bbox_inches='tight')
+    if not args.no_plot:
+        import matplotlib
+        matplotlib.use("Agg")  # Batch PNG export, no GUI event loop
+        import matplotlib.pyplot as plt
+
+        fig = plot_connectivity_comparison(analyzer)
+        fig.savefig("connectivity_comparison.png", dpi=300, bbox_inches='tight')
+        plt.close(fig)
 
     # Export comparison statistics
     comparisons = analyzer.compare_temperature_regimes()
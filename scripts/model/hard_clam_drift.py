@@ -13,26 +13,273 @@ Key Features:
 - Event recording: hatching/settlement time, location, and distance
 - Temperature exposure statistics: optimal, sublethal, and lethal ranges
 - Optional diel vertical migration (DVM)
+- Optional Numba kernels for the biology step and distances; they are
+  JIT-compiled on first use and cached on disk (no build step), with a
+  NumPy fallback when Numba is not installed
 
 Compatible with: OpenDrift 1.14.x
 """
 
 from __future__ import annotations
+import math
+import types
 import numpy as np
 from typing import Optional
 from opendrift.models.oceandrift import Lagrangian3DArray, OceanDrift
 
-
-def haversine_km(lon1, lat1, lon2, lat2):
-    """Calculate great-circle distance in km."""
-    R = 6371.0
-    lon1r, lat1r = np.radians(lon1), np.radians(lat1)
-    lon2r, lat2r = np.radians(lon2), np.radians(lat2)
-    dlon = lon2r - lon1r
-    dlat = lat2r - lat1r
-    a = np.sin(dlat/2.0)**2 + np.cos(lat1r)*np.cos(lat2r)*np.sin(dlon/2.0)**2
-    c = 2.0*np.arcsin(np.sqrt(a))
-    return R * c
+# Optional JIT compilation of the per-particle biology step
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Deactivation bit flags collected during a biology step; when several
+# apply to one element the later reason wins, as with successive calls
+HOTKILL, COLD_STAGNANT, LARVAL_COMPLETE = 1, 2, 4
+DEACTIVATION_REASONS = ((HOTKILL, 'hotkill'),
+                        (COLD_STAGNANT, 'larval_cold_stagnant'),
+                        (LARVAL_COMPLETE, 'larval_complete'))
+
+
+# float32 constants keep the distance calculations in single precision
+_DEG2RAD = np.float32(np.pi / 180.0)
+_HALF_DEG2RAD = np.float32(np.pi / 360.0)
+_EARTH_DIAMETER_KM = np.float32(2.0 * 6371.0)
+
+# Fast-math without the no-NaN/no-Inf assumptions: unseeded elements carry
+# NaN release coordinates that must propagate to the distances.
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+def haversine_km(lon1, lat1, lon2, lat2, out=None):
+    """
+    Calculate great-circle distance in km.
+
+    1-D inputs go through the single-pass Numba kernel when available;
+    the result is written into out (float32, allocated when None).
+    """
+    if HAS_NUMBA and np.ndim(lon1) == 1:
+        if out is None:
+            out = np.empty(np.shape(lon1), dtype=np.float32)
+        _haversine_km_nb(lon1, lat1, lon2, lat2, out)
+        return out
+
+    # Same formulation as the kernel: scale degree differences by constant
+    # multipliers rather than converting all four inputs with np.radians
+    s_lat = np.sin((lat2 - lat1) * _HALF_DEG2RAD)
+    s_lon = np.sin((lon2 - lon1) * _HALF_DEG2RAD)
+    a = s_lat * s_lat + np.cos(lat1 * _DEG2RAD) * np.cos(lat2 * _DEG2RAD) * s_lon * s_lon
+    c = np.arcsin(np.sqrt(a))
+    if out is None:
+        return _EARTH_DIAMETER_KM * c
+    return np.multiply(c, _EARTH_DIAMETER_KM, out=out)
+
+
+def _streak_update(cond, run, run_max, dt):
+    """
+    In-place run-length update: run += dt where cond, else reset to 0;
+    run_max keeps the longest run seen. No temporaries are allocated.
+    """
+    np.multiply(run, cond, out=run)
+    np.add(run, dt, out=run, where=cond)
+    np.maximum(run_max, run, out=run_max)
+
+
+def _contiguous(idx):
+    """
+    Sorted, duplicate-free indices as a slice when they form one run.
+
+    Slices index views, so accumulator updates become in-place instead of
+    gather/scatter; e.g. the whole population while every element is an egg.
+    """
+    if idx.size and idx[-1] - idx[0] + 1 == idx.size:
+        return slice(int(idx[0]), int(idx[-1]) + 1)
+    return idx
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=_FASTMATH)
+    def _great_circle_km(lon1, lat1, lon2, lat2):
+        """Scalar great-circle distance in km (float32 for float32 inputs)."""
+        s_lat = math.sin((lat2 - lat1) * _HALF_DEG2RAD)
+        s_lon = math.sin((lon2 - lon1) * _HALF_DEG2RAD)
+        a = (s_lat * s_lat +
+             math.cos(lat1 * _DEG2RAD) * math.cos(lat2 * _DEG2RAD) * s_lon * s_lon)
+        return _EARTH_DIAMETER_KM * math.asin(math.sqrt(a))
+
+    @njit(parallel=True, cache=True, fastmath=_FASTMATH)
+    def _haversine_km_nb(lon1, lat1, lon2, lat2, out):
+        """Fused great-circle distance kernel (km), written into out."""
+        for i in prange(out.shape[0]):
+            out[i] = _great_circle_km(lon1[i], lat1[i], lon2[i], lat2[i])
+
+    @njit(cache=True)
+    def _stage_exposure(stats, i, t, low, high, sublethal, dt32):
+        """
+        Stage hours, temperature integral and optimal-range exposure.
+
+        stats = (hours, temp_time_sum, opt_hours, opt_below_hours,
+                 opt_above_hours, cold_deg_h, hot_deg_h, sublethal_hours)
+        """
+        stats[0][i] += dt32
+        stats[1][i] += t * dt32
+        if t >= low and t <= high:
+            stats[2][i] += dt32
+        if t < low:
+            stats[3][i] += dt32
+        if t > high:
+            stats[4][i] += dt32
+        d = low - t
+        if not d <= 0:
+            stats[5][i] += d * dt32
+        d = t - high
+        if not d <= 0:
+            stats[6][i] += d * dt32
+        if sublethal:
+            stats[7][i] += dt32
+
+    # No fastmath: contraction/reassociation would change the float32
+    # accumulators relative to the NumPy path, and NaNs must propagate.
+    # CPU-only by design: OpenDrift owns the element arrays on the host and
+    # rewrites them every step, so a GPU port would ship every accumulator
+    # across the bus twice per step for ~100 flops of work per particle.
+    @njit(parallel=True, cache=True)
+    def _biology_kernel(T, depth, lon, lat, z, final_distance_km,
+                        stage, competent, settled_flag, age_h, acc_deg_h,
+                        progress, competent_time_h,
+                        hatch_time_h, hatch_lon, hatch_lat, hatch_distance_km,
+                        settle_time_h, settle_lon, settle_lat, settle_distance_km,
+                        hot_hours, hot_run, hot_run_max,
+                        cold_hours, cold_run, cold_run_max,
+                        sub_hours, sub_run, sub_run_max, sub_deg_h,
+                        egg_stats, larva_stats, near_bottom_hours,
+                        thresholds, k_egg, k_larva, limits,
+                        dt32, ht, dz, bottom_buf, half_m,
+                        do_settle, require_bottom, flags):
+        """
+        One biology step per particle in a single pass.
+
+        Mirrors HardClamDrift._biology_numpy (including the precision each
+        accumulator is computed in) and writes DEACTIVATION_REASONS bits
+        into flags instead of deactivating. Element arrays are passed flat:
+        arrays unpacked from tuples inside a parallel loop lose their writes.
+
+        Parameters:
+            egg_stats/larva_stats: stage accumulators, see _stage_exposure
+            thresholds: (Tcrit, T_sublethal, T0_egg, T0_larva, low_egg,
+                high_egg, low_larva, high_larva) as float32
+            limits: (hotkill_hours, hotkill_consec, stagnant_h); inf = off
+        """
+        t_crit, t_sub, t0_egg, t0_larva = thresholds[:4]
+        low_egg, high_egg, low_larva, high_larva = thresholds[4:]
+        kill_hours, kill_consec, stagnant_h = limits
+
+        for i in prange(T.shape[0]):
+            t = T[i]
+            flag = 0
+
+            # Lethal temperature exposure
+            if t >= t_crit:
+                hot_hours[i] += dt32
+                hot_run[i] += dt32
+            else:
+                hot_run[i] = 0.0
+            if hot_run[i] > hot_run_max[i]:
+                hot_run_max[i] = hot_run[i]
+            if hot_hours[i] >= kill_hours or hot_run[i] >= kill_consec:
+                flag |= HOTKILL
+
+            # Sublethal temperature exposure
+            is_sub = t >= t_sub
+            if is_sub:
+                sub_hours[i] += dt32
+                sub_run[i] += dt32
+            else:
+                sub_run[i] = 0.0
+            if sub_run[i] > sub_run_max[i]:
+                sub_run_max[i] = sub_run[i]
+            d = t - t_sub
+            if not d <= 0:
+                sub_deg_h[i] += d * dt32
+
+            # Egg stage
+            st = stage[i]
+            if st == 0:
+                d = t - t0_egg
+                if not d <= 0:
+                    acc_deg_h[i] += d * dt32
+                p = acc_deg_h[i] / k_egg
+                if p > 1.0:
+                    p = 1.0
+                progress[i] = p
+                _stage_exposure(egg_stats, i, t, low_egg, high_egg,
+                                is_sub, dt32)
+
+                if progress[i] >= 1.0:
+                    stage[i] = 1
+                    st = 1
+                    hatch_time_h[i] = ht
+                    hatch_lon[i] = lon[i]
+                    hatch_lat[i] = lat[i]
+                    hatch_distance_km[i] = final_distance_km[i]
+                    acc_deg_h[i] = 0.0
+                    progress[i] = 0.0
+
+            # Larval stage (including eggs that hatched this step)
+            if st == 1:
+                age_h[i] += dt32
+                d = t - t0_larva
+                if not d <= 0:
+                    acc_deg_h[i] += d * dt32
+                p = acc_deg_h[i] / k_larva
+                if p > 1.0:
+                    p = 1.0
+                progress[i] = p
+
+                if competent[i] == 0 and progress[i] >= 1.0:
+                    competent[i] = 1
+                    competent_time_h[i] = ht
+
+                if t <= t0_larva:
+                    cold_hours[i] += dt32
+                    cold_run[i] += dt32
+                else:
+                    cold_run[i] = 0.0
+                if cold_run[i] > cold_run_max[i]:
+                    cold_run_max[i] = cold_run[i]
+                if progress[i] < 1.0 and cold_run[i] >= stagnant_h:
+                    flag |= COLD_STAGNANT
+
+                _stage_exposure(larva_stats, i, t, low_larva, high_larva,
+                                is_sub, dt32)
+
+                bottom_limit = depth[i] - bottom_buf
+                near_bottom = -z[i] >= bottom_limit
+                if near_bottom:
+                    near_bottom_hours[i] += dt32
+
+                # Diel vertical migration, kept between 0.5 m and bottom-0.5 m
+                if dz != 0.0:
+                    zi = z[i] + dz
+                    if zi > -0.5:
+                        zi = -0.5
+                    floor = -depth[i] + half_m
+                    if floor > zi:
+                        zi = floor
+                    z[i] = zi
+                    near_bottom = -zi >= bottom_limit
+
+                if do_settle and progress[i] >= 1.0:
+                    if not require_bottom or near_bottom:
+                        settle_time_h[i] = ht
+                        settle_lon[i] = lon[i]
+                        settle_lat[i] = lat[i]
+                        settle_distance_km[i] = final_distance_km[i]
+                        settled_flag[i] = 1
+                        flag |= LARVAL_COMPLETE
+
+            flags[i] = flag
 
 
 class HardClamElement(Lagrangian3DArray):
@@ -93,6 +340,7 @@ class HardClamElement(Lagrangian3DArray):
         ('sublethal_hours_total',  {'dtype': np.float32, 'default': 0.0}),
         ('sublethal_hours_egg',    {'dtype': np.float32, 'default': 0.0}),
         ('sublethal_hours_larva',  {'dtype': np.float32, 'default': 0.0}),
+        ('sublethal_run',          {'dtype': np.float32, 'default': 0.0}),
         ('sublethal_run_max',      {'dtype': np.float32, 'default': 0.0}),
         ('sublethal_deg_h_total',  {'dtype': np.float32, 'default': 0.0}),
 
@@ -170,7 +418,9 @@ class HardClamDrift(OceanDrift):
 
         # Internal tracking
         self._t0 = None
-        self._sublethal_run = None
+        self._biol_const = None
+        self._scratch_f32 = None  # Reused by _degree_hours, grown on demand
+        self._ht_now = 0.0  # Hours since start, refreshed once per update()
 
     def _hours_since_start(self) -> float:
         """Calculate hours elapsed since simulation start."""
@@ -183,7 +433,7 @@ class HardClamDrift(OceanDrift):
         # Initialize on first frame
         if self._t0 is None:
             self._t0 = self.time
-            self._sublethal_run = np.zeros(self.elements.lon.size, dtype=np.float32)
+        self._ht_now = self._hours_since_start()
 
         # 1) Horizontal advection
         self.advect_ocean_current()
@@ -196,190 +446,287 @@ class HardClamDrift(OceanDrift):
         if self.get_config('drift:vertical_mixing'):
             self.vertical_mixing()
 
-        # 4) Biological processes
+        # 4) Update final distance for all active elements in one batch;
+        #    biology does not move elements horizontally, so hatching and
+        #    settlement take their event distance from it
+        e = self.elements
+        haversine_km(e.release_lon, e.release_lat, e.lon, e.lat,
+                     out=e.final_distance_km)
+
+        # 5) Biological processes
         self._biology()
 
-        # 5) Update final distance for all active elements
-        e = self.elements
-        active = np.ones(e.lon.size, dtype=bool)
-        e.final_distance_km[active] = haversine_km(
-            e.release_lon[active], e.release_lat[active],
-            e.lon[active], e.lat[active]
-        )
+    def _biology_constants(self) -> types.SimpleNamespace:
+        """
+        Biological parameters coerced to float32 once, at the first step.
+
+        Returns:
+            Namespace of thresholds; disabled mortality limits are inf
+        """
+        if self._biol_const is None:
+            f32 = np.float32
+
+            def limit(value, scale=1.0):
+                if value is None or value <= 0:
+                    return f32(np.inf)
+                return f32(float(value) * scale)
+
+            dt_h = self.time_step.total_seconds() / 3600.0
+            dvm = float(self.dvm_speed) if self.dvm_speed and self.dvm_speed > 0.0 else 0.0
+            self._biol_const = types.SimpleNamespace(
+                dt_h32=f32(dt_h),
+                Tcrit=f32(self.Tcrit), T_sublethal=f32(self.T_sublethal),
+                T0_egg=f32(self.T0_egg), K_egg=f32(self.K_egg),
+                T0_larva=f32(self.T0_larva), K_larva=f32(self.K_larva),
+                low_egg=f32(self.Topt_low_egg), high_egg=f32(self.Topt_high_egg),
+                low_larva=f32(self.Topt_low_larva), high_larva=f32(self.Topt_high_larva),
+                hotkill_hours=limit(self.hotkill_hours),
+                hotkill_consec=limit(self.hotkill_consec),
+                stagnant_h=limit(self.cold_stagnant_days, 24.0),
+                bottom_buffer=f32(self.settle_bottom_buffer_m),
+                dvm_step=f32(dvm * self.time_step.total_seconds()),
+            )
+        return self._biol_const
 
     def _biology(self):
         """Biological development and temperature response."""
+        # Environment variables are strided fields of OpenDrift's record
+        # array; pack the two read here into contiguous float32 columns
+        # once, so no step upcasts them (or the accumulators) to float64.
+        env = self.environment
+        T = np.ascontiguousarray(env.sea_water_temperature, dtype=np.float32)
+        depth = np.ascontiguousarray(env.sea_floor_depth_below_sea_level, dtype=np.float32)
+
+        if HAS_NUMBA:
+            self._biology_numba(T, depth)
+        else:
+            self._biology_numpy(T, depth)
+
+    def _biology_numba(self, T: np.ndarray, depth: np.ndarray):
+        """Fused single-pass biology step (see _biology_kernel)."""
         e = self.elements
-        dt_h = self.time_step.total_seconds() / 3600.0
-
-        # Get environmental conditions
-        T = self.environment.sea_water_temperature
-        depth = self.environment.sea_floor_depth_below_sea_level
+        c = self._biology_constants()
+
+        thresholds = (c.Tcrit, c.T_sublethal, c.T0_egg, c.T0_larva,
+                      c.low_egg, c.high_egg, c.low_larva, c.high_larva)
+        limits = (c.hotkill_hours, c.hotkill_consec, c.stagnant_h)
+        dz = -c.dvm_step if self.time.hour < 12 else c.dvm_step
+
+        flags = np.empty(e.lon.size, dtype=np.int8)
+        _biology_kernel(
+            T, depth, e.lon, e.lat, e.z, e.final_distance_km,
+            e.stage, e.competent, e.settled_flag, e.age_h, e.acc_deg_h,
+            e.progress, e.competent_time_h,
+            e.hatch_time_h, e.hatch_lon, e.hatch_lat, e.hatch_distance_km,
+            e.settle_time_h, e.settle_lon, e.settle_lat, e.settle_distance_km,
+            e.hot_hours, e.hot_run, e.hot_run_max,
+            e.cold_hours, e.cold_run, e.cold_run_max,
+            e.sublethal_hours_total, e.sublethal_run,
+            e.sublethal_run_max, e.sublethal_deg_h_total,
+            (e.egg_hours, e.temp_time_sum_egg, e.opt_hours_egg,
+             e.opt_below_hours_egg, e.opt_above_hours_egg,
+             e.cold_deg_h_egg, e.hot_deg_h_egg, e.sublethal_hours_egg),
+            (e.larva_hours, e.temp_time_sum_larva, e.opt_hours_larva,
+             e.opt_below_hours_larva, e.opt_above_hours_larva,
+             e.cold_deg_h_larva, e.hot_deg_h_larva, e.sublethal_hours_larva),
+            e.near_bottom_hours_larva, thresholds,
+            c.K_egg, c.K_larva, limits,
+            c.dt_h32, self._ht_now, dz, c.bottom_buffer, np.float32(0.5),
+            bool(self.stop_when_larva_complete), bool(self.settle_require_bottom),
+            flags)
+
+        self._apply_deactivations(flags)
+
+    def _biology_numpy(self, T: np.ndarray, depth: np.ndarray):
+        """Biological development and temperature response (NumPy path)."""
+        e = self.elements
+        c = self._biology_constants()
+        dt_h32 = c.dt_h32
+        flags = np.zeros(e.lon.size, dtype=np.int8)
 
         # === Lethal temperature exposure ===
-        is_hot_all = (T >= float(self.Tcrit))
-        e.hot_hours += is_hot_all.astype(float) * dt_h
-        e.hot_run = np.where(is_hot_all, e.hot_run + dt_h, 0.0)
-        e.hot_run_max = np.maximum(e.hot_run_max, e.hot_run)
-
-        # Check for heat-induced mortality
-        to_kill_hot = np.zeros(e.lon.size, dtype=bool)
-        if self.hotkill_hours is not None and self.hotkill_hours > 0:
-            to_kill_hot |= (e.hot_hours >= float(self.hotkill_hours))
-        if self.hotkill_consec is not None and self.hotkill_consec > 0:
-            to_kill_hot |= (e.hot_run >= float(self.hotkill_consec))
-        if np.any(to_kill_hot):
-            self.deactivate_elements(to_kill_hot, reason='hotkill')
+        is_hot_all = (T >= c.Tcrit)
+        e.hot_hours += is_hot_all * dt_h32
+        _streak_update(is_hot_all, e.hot_run, e.hot_run_max, dt_h32)
+
+        # Check for heat-induced mortality (a disabled limit is inf)
+        if c.hotkill_hours < np.inf or c.hotkill_consec < np.inf:
+            to_kill_hot = (e.hot_hours >= c.hotkill_hours) | (e.hot_run >= c.hotkill_consec)
+            flags[to_kill_hot] = HOTKILL
 
         # === Sublethal temperature exposure (v3 feature) ===
-        is_sublethal_all = (T >= float(self.T_sublethal))
-        e.sublethal_hours_total += is_sublethal_all.astype(float) * dt_h
+        is_sublethal_all = (T >= c.T_sublethal)
+        e.sublethal_hours_total += is_sublethal_all * dt_h32
 
-        if self._sublethal_run is not None:
-            self._sublethal_run = np.where(is_sublethal_all,
-                                          self._sublethal_run + dt_h, 0.0)
-            e.sublethal_run_max = np.maximum(e.sublethal_run_max, self._sublethal_run)
+        _streak_update(is_sublethal_all, e.sublethal_run, e.sublethal_run_max, dt_h32)
 
         # Temperature excess integral
-        e.sublethal_deg_h_total += np.maximum(0.0, T - float(self.T_sublethal)).astype(float) * dt_h
+        e.sublethal_deg_h_total += self._degree_hours(T, c.T_sublethal, dt_h32)
 
         # === Egg stage (stage=0) ===
-        egg = (e.stage == 0)
-        if np.any(egg):
+        # Stage selectors (index arrays, or slices for contiguous runs)
+        # are reused across every accumulator of the stage
+        idx_egg = np.flatnonzero(e.stage == 0)
+        if idx_egg.size:
+            egg = _contiguous(idx_egg)
+            T_egg = T[egg]
+
             # Accumulated temperature development
-            dT1 = np.maximum(0.0, T[egg] - float(self.T0_egg))
-            e.acc_deg_h[egg] += dT1 * dt_h
-            e.progress[egg] = np.minimum(1.0, e.acc_deg_h[egg] / float(self.K_egg))
+            e.acc_deg_h[egg] += self._degree_hours(T_egg, c.T0_egg, dt_h32)
+            prog_egg = np.minimum(1.0, e.acc_deg_h[egg] / c.K_egg)
+            e.progress[egg] = prog_egg
 
             # Stage statistics
-            e.egg_hours[egg] += dt_h
-            e.temp_time_sum_egg[egg] += T[egg].astype(float) * dt_h
+            e.egg_hours[egg] += dt_h32
+            e.temp_time_sum_egg[egg] += T_egg * dt_h32
 
             # Optimal temperature exposure (egg: 25-27°C)
-            low_egg, high_egg = float(self.Topt_low_egg), float(self.Topt_high_egg)
-            T_egg = T[egg]
+            low_egg, high_egg = c.low_egg, c.high_egg
             is_opt_egg = (T_egg >= low_egg) & (T_egg <= high_egg)
             is_below_egg = (T_egg < low_egg)
             is_above_egg = (T_egg > high_egg)
-            e.opt_hours_egg[egg] += is_opt_egg.astype(float) * dt_h
-            e.opt_below_hours_egg[egg] += is_below_egg.astype(float) * dt_h
-            e.opt_above_hours_egg[egg] += is_above_egg.astype(float) * dt_h
+            e.opt_hours_egg[egg] += is_opt_egg * dt_h32
+            e.opt_below_hours_egg[egg] += is_below_egg * dt_h32
+            e.opt_above_hours_egg[egg] += is_above_egg * dt_h32
 
             # Temperature deviation integrals
-            e.cold_deg_h_egg[egg] += np.maximum(0.0, low_egg - T_egg).astype(float) * dt_h
-            e.hot_deg_h_egg[egg] += np.maximum(0.0, T_egg - high_egg).astype(float) * dt_h
+            e.cold_deg_h_egg[egg] += self._degree_hours(low_egg, T_egg, dt_h32)
+            e.hot_deg_h_egg[egg] += self._degree_hours(T_egg, high_egg, dt_h32)
 
             # Sublethal exposure (egg stage)
-            is_sublethal_egg = (T_egg >= float(self.T_sublethal))
-            e.sublethal_hours_egg[egg] += is_sublethal_egg.astype(float) * dt_h
+            is_sublethal_egg = is_sublethal_all[egg]
+            e.sublethal_hours_egg[egg] += is_sublethal_egg * dt_h32
 
-            # Hatching trigger
-            hatch = egg & (e.progress >= 1.0)
-            if np.any(hatch):
+            # Hatching trigger (tested on the egg subset only)
+            hatch = idx_egg[prog_egg >= 1.0]
+            if hatch.size:
                 e.stage[hatch] = 1
-                e.hatch_time_h[hatch] = self._hours_since_start()
+                e.hatch_time_h[hatch] = self._ht_now
                 e.hatch_lon[hatch] = e.lon[hatch]
                 e.hatch_lat[hatch] = e.lat[hatch]
-                e.hatch_distance_km[hatch] = haversine_km(
-                    e.release_lon[hatch], e.release_lat[hatch],
-                    e.lon[hatch], e.lat[hatch]
-                )
+                e.hatch_distance_km[hatch] = e.final_distance_km[hatch]
                 # Reset for larval stage
                 e.acc_deg_h[hatch] = 0.0
                 e.progress[hatch] = 0.0
 
         # === Larval stage (stage=1) ===
-        larva = (e.stage == 1)
-        if np.any(larva):
-            e.age_h[larva] += dt_h
+        idx_larva = np.flatnonzero(e.stage == 1)
+        if idx_larva.size:
+            larva = _contiguous(idx_larva)
+            T_larva = T[larva]
+            e.age_h[larva] += dt_h32
 
             # Accumulated temperature development
-            dT2 = np.maximum(0.0, T[larva] - float(self.T0_larva))
-            e.acc_deg_h[larva] += dT2 * dt_h
-            e.progress[larva] = np.minimum(1.0, e.acc_deg_h[larva] / float(self.K_larva))
+            e.acc_deg_h[larva] += self._degree_hours(T_larva, c.T0_larva, dt_h32)
+            prog_larva = np.minimum(1.0, e.acc_deg_h[larva] / c.K_larva)
+            e.progress[larva] = prog_larva
+            complete = prog_larva >= 1.0
 
             # Competency check
-            comp_new = larva & (e.competent == 0) & (e.progress >= 1.0)
-            if np.any(comp_new):
+            comp_new = idx_larva[complete & (e.competent[larva] == 0)]
+            if comp_new.size:
                 e.competent[comp_new] = 1
-                e.competent_time_h[comp_new] = self._hours_since_start()
+                e.competent_time_h[comp_new] = self._ht_now
 
             # Cold exposure and stagnation
-            is_cold = (T[larva] <= float(self.T0_larva))
-            e.cold_hours[larva] += is_cold.astype(float) * dt_h
-            new_run = e.cold_run[larva] + is_cold.astype(float) * dt_h
-            e.cold_run[larva] = np.where(is_cold, new_run, 0.0)
-            e.cold_run_max[larva] = np.maximum(e.cold_run_max[larva], e.cold_run[larva])
+            is_cold = (T_larva <= c.T0_larva)
+            e.cold_hours[larva] += is_cold * dt_h32
+            cold_run, cold_run_max = e.cold_run[larva], e.cold_run_max[larva]
+            _streak_update(is_cold, cold_run, cold_run_max, dt_h32)
+            e.cold_run[larva] = cold_run
+            e.cold_run_max[larva] = cold_run_max
 
             # Check for cold stagnation mortality
-            if self.cold_stagnant_days is not None and self.cold_stagnant_days > 0:
-                limit_h = float(self.cold_stagnant_days) * 24.0
-                stagn = larva & (e.progress < 1.0) & (e.cold_run >= limit_h)
-                if np.any(stagn):
-                    self.deactivate_elements(stagn, reason='larval_cold_stagnant')
+            if c.stagnant_h < np.inf:
+                stagn = idx_larva[~complete & (cold_run >= c.stagnant_h)]
+                flags[stagn] |= COLD_STAGNANT
 
             # Stage statistics
-            e.larva_hours[larva] += dt_h
-            T_larva = T[larva]
-            e.temp_time_sum_larva[larva] += T_larva.astype(float) * dt_h
+            e.larva_hours[larva] += dt_h32
+            e.temp_time_sum_larva[larva] += T_larva * dt_h32
 
             # Optimal temperature exposure (larva: 27-29°C)
-            low_larva, high_larva = float(self.Topt_low_larva), float(self.Topt_high_larva)
+            low_larva, high_larva = c.low_larva, c.high_larva
             is_opt_larva = (T_larva >= low_larva) & (T_larva <= high_larva)
             is_below_larva = (T_larva < low_larva)
             is_above_larva = (T_larva > high_larva)
-            e.opt_hours_larva[larva] += is_opt_larva.astype(float) * dt_h
-            e.opt_below_hours_larva[larva] += is_below_larva.astype(float) * dt_h
-            e.opt_above_hours_larva[larva] += is_above_larva.astype(float) * dt_h
+            e.opt_hours_larva[larva] += is_opt_larva * dt_h32
+            e.opt_below_hours_larva[larva] += is_below_larva * dt_h32
+            e.opt_above_hours_larva[larva] += is_above_larva * dt_h32
 
             # Temperature deviation integrals
-            e.cold_deg_h_larva[larva] += np.maximum(0.0, low_larva - T_larva).astype(float) * dt_h
-            e.hot_deg_h_larva[larva] += np.maximum(0.0, T_larva - high_larva).astype(float) * dt_h
+            e.cold_deg_h_larva[larva] += self._degree_hours(low_larva, T_larva, dt_h32)
+            e.hot_deg_h_larva[larva] += self._degree_hours(T_larva, high_larva, dt_h32)
 
             # Sublethal exposure (larval stage)
-            is_sublethal_larva = (T_larva >= float(self.T_sublethal))
-            e.sublethal_hours_larva[larva] += is_sublethal_larva.astype(float) * dt_h
+            is_sublethal_larva = is_sublethal_all[larva]
+            e.sublethal_hours_larva[larva] += is_sublethal_larva * dt_h32
 
             # Near-bottom exposure
             dloc = depth[larva]
-            near_bottom = (-e.z[larva]) >= (dloc - float(self.settle_bottom_buffer_m))
-            e.near_bottom_hours_larva[larva] += near_bottom.astype(float) * dt_h
+            bottom_limit = dloc - c.bottom_buffer
+            near_bottom = (-e.z[larva]) >= bottom_limit
+            e.near_bottom_hours_larva[larva] += near_bottom * dt_h32
 
             # Optional diel vertical migration
-            if self.dvm_speed and self.dvm_speed > 0.0:
-                direction = -1 if self.time.hour < 12 else 1
-                dz = direction * float(self.dvm_speed) * self.time_step.total_seconds()
-                e.z[larva] = e.z[larva] + dz
-                dloc = depth[larva]
-                # Constrain between 0.5m and bottom-0.5m
-                e.z[larva] = np.minimum(-0.5, e.z[larva])
-                e.z[larva] = np.maximum(-dloc + 0.5, e.z[larva])
+            if c.dvm_step > 0.0:
+                dz = -c.dvm_step if self.time.hour < 12 else c.dvm_step
+                z = e.z[larva] + dz
+                # Constrain between 0.5m and bottom-0.5m; the bottom wins
+                # where the water is shallower than 1m, so not np.clip
+                np.minimum(z, -0.5, out=z)
+                np.maximum(z, 0.5 - dloc, out=z)
+                e.z[larva] = z
+                # Settlement tests proximity at the migrated depth
+                near_bottom = -z >= bottom_limit
 
             # Settlement upon completion
             if self.stop_when_larva_complete:
-                done = larva & (e.progress >= 1.0)
-
                 # Filter by bottom proximity if required
-                if np.any(done) and self.settle_require_bottom:
-                    dloc = depth[done]
-                    near_bottom = (-e.z[done]) >= (dloc - float(self.settle_bottom_buffer_m))
-                    idx_done = np.where(done)[0][near_bottom]
-                else:
-                    idx_done = np.where(done)[0]
+                if self.settle_require_bottom:
+                    complete &= near_bottom
+                idx_done = idx_larva[complete]
 
                 if idx_done.size > 0:
-                    ht = self._hours_since_start()
-                    e.settle_time_h[idx_done] = ht
+                    e.settle_time_h[idx_done] = self._ht_now
                     e.settled_flag[idx_done] = 1
                     e.settle_lon[idx_done] = e.lon[idx_done]
                     e.settle_lat[idx_done] = e.lat[idx_done]
-                    e.settle_distance_km[idx_done] = haversine_km(
-                        e.release_lon[idx_done], e.release_lat[idx_done],
-                        e.lon[idx_done], e.lat[idx_done]
-                    )
-                    mask = np.zeros(e.lon.size, dtype=bool)
-                    mask[idx_done] = True
-                    self.deactivate_elements(mask, reason='larval_complete')
+                    e.settle_distance_km[idx_done] = e.final_distance_km[idx_done]
+                    flags[idx_done] |= LARVAL_COMPLETE
+
+        self._apply_deactivations(flags)
+
+    def _degree_hours(self, upper, lower, dt_h32: np.float32) -> np.ndarray:
+        """
+        max(0, upper - lower) * dt in a reusable float32 scratch buffer.
+
+        The result is overwritten by the next call, so consume it at once.
+        """
+        n = np.broadcast(upper, lower).size
+        if self._scratch_f32 is None or self._scratch_f32.size < n:
+            self._scratch_f32 = np.empty(n, dtype=np.float32)
+        out = self._scratch_f32[:n]
+        np.subtract(upper, lower, out=out)
+        np.maximum(out, 0.0, out=out)
+        out *= dt_h32
+        return out
+
+    def _apply_deactivations(self, flags: np.ndarray):
+        """
+        Deactivate flagged elements with one call per reason.
+
+        Each element is deactivated once, with the last of its reasons in
+        DEACTIVATION_REASONS order.
+        """
+        pending = flags != 0
+        if not pending.any():
+            return
+        for bit, reason in reversed(DEACTIVATION_REASONS):
+            sel = pending & ((flags & bit) != 0)
+            if sel.any():
+                self.deactivate_elements(sel, reason=reason)
+                pending &= ~sel
 
 
 def add_kz_constant_reader(model: OceanDrift, kz_value: float):
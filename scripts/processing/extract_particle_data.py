@@ -18,6 +18,24 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import warnings
 
+try:
+    import dask  # noqa: F401  (enables chunked reads in xarray)
+    HAS_DASK = True
+except ImportError:
+    HAS_DASK = False
+
+try:
+    import pyarrow  # noqa: F401  (Parquet output)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 warnings.filterwarnings('ignore')
 
 # ----------------- Configuration -----------------
@@ -30,6 +48,11 @@ MPA_ZONES = {
     "SMPA-4": {"lat": [38.2, 38.5], "lon": [120.5, 120.8]}
 }
 
+# Zone bounds as arrays for vectorized lookup (same order as MPA_ZONES)
+_ZONE_NAMES = np.array(list(MPA_ZONES.keys()))
+_LAT_LO, _LAT_HI = np.array([b["lat"] for b in MPA_ZONES.values()]).T
+_LON_LO, _LON_HI = np.array([b["lon"] for b in MPA_ZONES.values()]).T
+
 # Temperature thresholds (based on literature)
 TOPT_LOW_EGG = 25.0    # Egg optimal lower bound
 TOPT_HIGH_EGG = 27.0   # Egg optimal upper bound
@@ -42,6 +65,101 @@ T_LETHAL = 33.0        # Lethal threshold
 T0_EGG = 12.9          # Egg development threshold (°C)
 T0_LARVA = 19.0        # Larval development threshold (°C)
 
+# NetCDF chunking (particles per chunk, whole time series per particle)
+TRAJECTORY_CHUNK = 1024
+
+# Variables read from the trajectory file (optional ones may be missing)
+EXTRACT_VARIABLES = ['lon', 'lat', 'status', 'stage', 'age_h', 'progress',
+                     'sea_water_temperature', 'release_id', 'release_day']
+
+# Fast-math without the no-NaN/no-Inf assumptions: temperatures are NaN at
+# masked steps and NaN must propagate exactly as in the NumPy path.
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True, fastmath=_FASTMATH)
+    def _temperature_metrics_kernel(temp, stage, end_idx, opt_low, opt_high,
+                                    overall, extremes, stage_hours,
+                                    stage_stats, stage_counts):
+        """
+        Per-particle temperature metrics over the valid steps t < end_idx[i].
+
+        Same statistics as the NumPy path of _calculate_temperature_metrics.
+        Outputs (stage s: 0=egg, 1=larva; zero-initialised except overall):
+            overall[i]: mean, std, min, max
+            extremes[i]: hours >= T_SUBLETHAL, hours >= T_LETHAL, longest hot run
+            stage_hours[i, s]: hours in the stage
+            stage_stats[i, s]: mean, std, hot and cold degree-hours
+            stage_counts[i, s]: optimal hours, hot hours, finite hours
+        Mean and std use Welford's update, so each row is read once.
+        A stage array without rows skips the stage metrics.
+        """
+        n_particles = temp.shape[0]
+        use_stage = stage.shape[0] == n_particles
+        for i in prange(n_particles):
+            # One pass per row: Welford running mean/M2 alongside the counts
+            n = 0
+            mean = 0.0
+            m2 = 0.0
+            t_min = np.inf
+            t_max = -np.inf
+            run = 0
+            for t in range(end_idx[i]):
+                x = temp[i, t]
+                finite = not np.isnan(x)
+                if finite:
+                    n += 1
+                    delta = x - mean
+                    mean += delta / n
+                    m2 += delta * (x - mean)
+                    t_min = min(t_min, x)
+                    t_max = max(t_max, x)
+
+                hot = x >= T_SUBLETHAL
+                if hot:
+                    extremes[i, 0] += 1
+                    run += 1
+                    extremes[i, 2] = max(extremes[i, 2], run)
+                else:
+                    run = 0
+                if x >= T_LETHAL:
+                    extremes[i, 1] += 1
+
+                if use_stage:
+                    s = stage[i, t]
+                    if s < 2:
+                        stage_hours[i, s] += 1
+                        if finite:
+                            stage_counts[i, s, 2] += 1
+                            delta = x - stage_stats[i, s, 0]
+                            stage_stats[i, s, 0] += delta / stage_counts[i, s, 2]
+                            stage_stats[i, s, 1] += delta * (x - stage_stats[i, s, 0])
+                        if x >= opt_low[s] and x <= opt_high[s]:
+                            stage_counts[i, s, 0] += 1
+                        if hot:
+                            stage_counts[i, s, 1] += 1
+                        # Excesses; a NaN temperature makes the sum NaN
+                        d = x - opt_high[s]
+                        if not d <= 0:
+                            stage_stats[i, s, 2] += d
+                        d = opt_low[s] - x
+                        if not d <= 0:
+                            stage_stats[i, s, 3] += d
+
+            # Population std (ddof=0) from M2; NaN without finite values
+            overall[i, 0] = mean if n > 0 else np.nan
+            overall[i, 1] = np.sqrt(m2 / n) if n > 0 else np.nan
+            overall[i, 2] = t_min if n > 0 else np.nan
+            overall[i, 3] = t_max if n > 0 else np.nan
+            for s in range(2):
+                k = stage_counts[i, s, 2]
+                if k > 0:
+                    stage_stats[i, s, 1] = np.sqrt(stage_stats[i, s, 1] / k)
+                else:
+                    stage_stats[i, s, 0] = np.nan
+                    stage_stats[i, s, 1] = np.nan
+
 
 class ParticleDataExtractor:
     """Extract and process particle tracking data from NetCDF files."""
@@ -58,8 +176,18 @@ class ParticleDataExtractor:
         self.particle_df = None
 
     def load_netcdf(self):
-        """Load NetCDF dataset."""
-        self.ds = xr.open_dataset(self.nc_path)
+        """Load the variables used for extraction into memory."""
+        # Times are not used, so skip decoding them
+        if HAS_DASK:
+            # Read whole trajectories per chunk rather than one time step at a time
+            ds = xr.open_dataset(self.nc_path, decode_times=False,
+                                 chunks={'trajectory': TRAJECTORY_CHUNK})
+        else:
+            ds = xr.open_dataset(self.nc_path, decode_times=False)
+
+        # Pull only the needed variables, in one pass over the file
+        self.ds = ds[[v for v in EXTRACT_VARIABLES if v in ds]].load()
+        ds.close()
         print(f"Loaded {self.nc_path.name}")
         print(f"  Particles: {self.ds.dims['trajectory']}")
         print(f"  Time steps: {self.ds.dims['time']}")
@@ -73,93 +201,102 @@ class ParticleDataExtractor:
         """
         # Get dimensions
         n_particles = self.ds.dims['trajectory']
-        n_times = self.ds.dims['time']
-
-        # Initialize lists to store particle data
-        particle_data = []
-
-        # Process each particle
-        for i in range(n_particles):
-            # Get trajectory data
-            lon = self.ds['lon'].values[i, :]
-            lat = self.ds['lat'].values[i, :]
-            z = self.ds['z'].values[i, :] if 'z' in self.ds else np.zeros(n_times)
-            status = self.ds['status'].values[i, :]
-
-            # Get biological variables
-            stage = self.ds['stage'].values[i, :] if 'stage' in self.ds else None
-            age_h = self.ds['age_h'].values[i, :] if 'age_h' in self.ds else None
-            progress = self.ds['progress'].values[i, :] if 'progress' in self.ds else None
-
-            # Get temperature data
-            temp = self.ds['sea_water_temperature'].values[i, :] if \
-                   'sea_water_temperature' in self.ds else None
-
-            # Get release info
-            release_id = self.ds['release_id'].values[i] if 'release_id' in self.ds else i
-            release_day = self.ds['release_day'].values[i] if 'release_day' in self.ds else 0
-
-            # Find key events
-            release_idx = 0
-            settle_idx = self._find_settlement(status)
-            hatch_idx = self._find_hatching(stage) if stage is not None else None
-
-            # Calculate metrics
-            particle_dict = {
-                'particle_id': i,
-                'release_id': release_id,
-                'release_day': release_day,
-                'release_lon': lon[release_idx],
-                'release_lat': lat[release_idx],
-                'release_zone': self._identify_zone(lon[release_idx], lat[release_idx])
-            }
+        rows = np.arange(n_particles)
+
+        # Read each variable once as a (particle, time) array
+        lon = self._read_array('lon')
+        lat = self._read_array('lat')
+        status = self._read_array('status', np.uint8)
+
+        # Get biological variables
+        stage = self._read_array('stage', np.uint8)
+        age_h = self._read_array('age_h')
+        progress = self._read_array('progress')
+
+        # Get temperature data
+        temp = self._read_array('sea_water_temperature')
+
+        # Get release info
+        release_id = self.ds['release_id'].values if 'release_id' in self.ds else rows
+        release_day = self.ds['release_day'].values if 'release_day' in self.ds else \
+                      np.zeros(n_particles, dtype=int)
+
+        # Find key events for all particles at once
+        settled, settle_idx = self._find_settlement(status)
+
+        release_lon = lon[:, 0]
+        release_lat = lat[:, 0]
+        settle_lon = np.where(settled, lon[rows, settle_idx], np.nan)
+        settle_lat = np.where(settled, lat[rows, settle_idx], np.nan)
+
+        columns = {
+            'particle_id': rows,
+            'release_id': release_id,
+            'release_day': release_day,
+            'release_lon': release_lon,
+            'release_lat': release_lat,
+            'release_zone': self._identify_zones(release_lon, release_lat),
 
             # Settlement info
-            if settle_idx is not None:
-                particle_dict.update({
-                    'settled': True,
-                    'settle_time_h': settle_idx,  # Convert to hours based on output frequency
-                    'settle_lon': lon[settle_idx],
-                    'settle_lat': lat[settle_idx],
-                    'settle_zone': self._identify_zone(lon[settle_idx], lat[settle_idx]),
-                    'distance_km': self._haversine_distance(
-                        lon[release_idx], lat[release_idx],
-                        lon[settle_idx], lat[settle_idx]
-                    )
-                })
-            else:
-                particle_dict.update({
-                    'settled': False,
-                    'settle_time_h': np.nan,
-                    'settle_lon': np.nan,
-                    'settle_lat': np.nan,
-                    'settle_zone': 'UNSETTLED',
-                    'distance_km': np.nan
-                })
+            'settled': settled,
+            'settle_time_h': np.where(settled, settle_idx, np.nan),  # Output steps
+            'settle_lon': settle_lon,
+            'settle_lat': settle_lat,
+            'settle_zone': np.where(settled,
+                                    self._identify_zones(settle_lon, settle_lat),
+                                    'UNSETTLED'),
+            # NaN settlement coordinates leave unsettled particles at NaN
+            'distance_km': self._haversine_distance(release_lon, release_lat,
+                                                    settle_lon, settle_lat)
+        }
+
+        # Valid period (until settlement or end) and the step each particle ends on
+        n_times = status.shape[1]
+        end_idx = np.where(settled, settle_idx, n_times)
+        valid = np.arange(n_times) < end_idx[:, None]
+        final_idx = np.where(settled, settle_idx, n_times - 1)
+
+        # Temperature metrics
+        if temp is not None:
+            columns.update(self._calculate_temperature_metrics(temp, valid, end_idx, stage))
 
-            # Temperature metrics
-            if temp is not None:
-                particle_dict.update(self._calculate_temperature_metrics(
-                    temp, stage, settle_idx
-                ))
+        # Development metrics
+        if stage is not None and progress is not None:
+            columns.update(self._calculate_development_metrics(
+                stage, progress, valid, final_idx, age_h
+            ))
 
-            # Development metrics
-            if stage is not None and progress is not None:
-                particle_dict.update(self._calculate_development_metrics(
-                    stage, progress, age_h, settle_idx
-                ))
+        return pd.DataFrame(columns)
 
-            particle_data.append(particle_dict)
+    def _read_array(self, name: str, dtype=np.float32) -> np.ndarray:
+        """
+        Read a variable as a compact array (None if not in the file).
 
-        return pd.DataFrame(particle_data)
+        Ocean-model output only carries single precision, so floats are kept
+        as float32; status and stage codes fit in one byte, with the steps
+        masked after deactivation (NaN) set to 255.
+        """
+        if name not in self.ds:
+            return None
+        var = self.ds[name]
+        if np.issubdtype(dtype, np.integer):
+            var = var.fillna(255)
+        return var.values.astype(dtype, copy=False)
+
+    def _find_settlement(self, status: np.ndarray) -> tuple:
+        """
+        Find the index where each particle settled.
 
-    def _find_settlement(self, status: np.ndarray) -> int:
-        """Find index where particle settled."""
+        Parameters:
+            status: (particle, time) status codes
+
+        Returns:
+            Tuple of (settled flags, first settlement index; -1 where not settled)
+        """
         # Status codes: 0=active, 2=stranded/settled, 3=deactivated
         settled_mask = (status == 2) | (status == 3)
-        if np.any(settled_mask):
-            return np.argmax(settled_mask)
-        return None
+        settled = settled_mask.any(axis=1)
+        return settled, np.where(settled, settled_mask.argmax(axis=1), -1)
 
     def _find_hatching(self, stage: np.ndarray) -> int:
         """Find index where particle hatched (stage 0->1)."""
@@ -170,16 +307,27 @@ class ParticleDataExtractor:
             return np.argmax(hatch_mask)
         return None
 
-    def _identify_zone(self, lon: float, lat: float) -> str:
-        """Identify which MPA zone a point belongs to."""
-        for zone_name, bounds in MPA_ZONES.items():
-            if (bounds['lat'][0] <= lat <= bounds['lat'][1] and
-                bounds['lon'][0] <= lon <= bounds['lon'][1]):
-                return zone_name
-        return 'OUTSIDE'
+    def _identify_zones(self, lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """
+        Identify which MPA zone each point belongs to.
+
+        Parameters:
+            lon, lat: Point coordinates
+
+        Returns:
+            Array of zone names ('OUTSIDE' where no zone matches)
+        """
+        lon = np.asarray(lon)[:, None]
+        lat = np.asarray(lat)[:, None]
+
+        inside = ((lat >= _LAT_LO) & (lat <= _LAT_HI) &
+                  (lon >= _LON_LO) & (lon <= _LON_HI))
+
+        # First matching zone wins, as in the MPA_ZONES order
+        return np.where(inside.any(axis=1), _ZONE_NAMES[inside.argmax(axis=1)], 'OUTSIDE')
 
     def _haversine_distance(self, lon1, lat1, lon2, lat2):
-        """Calculate great-circle distance in km."""
+        """Calculate great-circle distance in km (element-wise on arrays)."""
         R = 6371.0
         lon1_rad = np.radians(lon1)
         lat1_rad = np.radians(lat1)
@@ -195,137 +343,185 @@ class ParticleDataExtractor:
         return R * c
 
     def _calculate_temperature_metrics(self, temp: np.ndarray,
-                                      stage: np.ndarray = None,
-                                      settle_idx: int = None) -> dict:
+                                      valid: np.ndarray,
+                                      end_idx: np.ndarray,
+                                      stage: np.ndarray = None) -> dict:
         """
-        Calculate temperature exposure metrics.
+        Calculate temperature exposure metrics for all particles.
+
+        Parameters:
+            temp: (particle, time) temperature
+            valid: (particle, time) mask of steps before settlement
+            end_idx: Number of valid steps of each particle
+            stage: (particle, time) life stage
 
         Returns:
-            Dictionary with temperature statistics
+            Dictionary of per-particle temperature arrays
         """
+        if HAS_NUMBA:
+            return self._temperature_metrics_numba(temp, end_idx, stage)
+
         metrics = {}
 
-        # Define valid period (until settlement or end)
-        end_idx = settle_idx if settle_idx is not None else len(temp)
-        valid_temp = temp[:end_idx]
+        # Temperatures within the valid period (NaN elsewhere)
+        valid_temp = np.where(valid, temp, np.nan)
 
         # Overall statistics
-        metrics['temp_mean'] = np.nanmean(valid_temp)
-        metrics['temp_std'] = np.nanstd(valid_temp)
-        metrics['temp_min'] = np.nanmin(valid_temp)
-        metrics['temp_max'] = np.nanmax(valid_temp)
+        metrics['temp_mean'] = np.nanmean(valid_temp, axis=1)
+        metrics['temp_std'] = np.nanstd(valid_temp, axis=1)
+        metrics['temp_min'] = np.nanmin(valid_temp, axis=1)
+        metrics['temp_max'] = np.nanmax(valid_temp, axis=1)
 
         # Stage-specific statistics
         if stage is not None:
-            # Egg stage
-            egg_mask = stage[:end_idx] == 0
-            if np.any(egg_mask):
-                egg_temp = valid_temp[egg_mask]
-                metrics['temp_mean_egg'] = np.nanmean(egg_temp)
-                metrics['temp_std_egg'] = np.nanstd(egg_temp)
-
-                # Optimal temperature exposure (egg)
-                opt_egg = np.sum((egg_temp >= TOPT_LOW_EGG) &
-                                (egg_temp <= TOPT_HIGH_EGG))
-                metrics['frac_egg_hours_optimal'] = opt_egg / len(egg_temp)
-
-                # High temperature exposure (egg)
-                hot_egg = np.sum(egg_temp >= T_SUBLETHAL)
-                metrics['frac_egg_hours_hot'] = hot_egg / len(egg_temp)
-
-                # Degree-day deviations (egg)
-                metrics['hot_deg_h_egg'] = np.sum(np.maximum(0, egg_temp - TOPT_HIGH_EGG))
-                metrics['cold_deg_h_egg'] = np.sum(np.maximum(0, TOPT_LOW_EGG - egg_temp))
-
-            # Larval stage
-            larva_mask = stage[:end_idx] == 1
-            if np.any(larva_mask):
-                larva_temp = valid_temp[larva_mask]
-                metrics['temp_mean_larva'] = np.nanmean(larva_temp)
-                metrics['temp_std_larva'] = np.nanstd(larva_temp)
-
-                # Optimal temperature exposure (larva)
-                opt_larva = np.sum((larva_temp >= TOPT_LOW_LARVA) &
-                                  (larva_temp <= TOPT_HIGH_LARVA))
-                metrics['frac_larva_hours_optimal'] = opt_larva / len(larva_temp)
-
-                # High temperature exposure (larva)
-                hot_larva = np.sum(larva_temp >= T_SUBLETHAL)
-                metrics['frac_larva_hours_hot'] = hot_larva / len(larva_temp)
-
-                # Degree-day deviations (larva)
-                metrics['hot_deg_h_larva'] = np.sum(np.maximum(0, larva_temp - TOPT_HIGH_LARVA))
-                metrics['cold_deg_h_larva'] = np.sum(np.maximum(0, TOPT_LOW_LARVA - larva_temp))
+            metrics.update(self._stage_temperature_metrics(
+                temp, valid & (stage == 0), TOPT_LOW_EGG, TOPT_HIGH_EGG, 'egg'))
+            metrics.update(self._stage_temperature_metrics(
+                temp, valid & (stage == 1), TOPT_LOW_LARVA, TOPT_HIGH_LARVA, 'larva'))
 
         # Extreme temperature events
-        metrics['hours_above_30'] = np.sum(valid_temp >= T_SUBLETHAL)
-        metrics['hours_above_33'] = np.sum(valid_temp >= T_LETHAL)
+        above_30 = valid_temp >= T_SUBLETHAL
+        metrics['hours_above_30'] = np.sum(above_30, axis=1)
+        metrics['hours_above_33'] = np.sum(valid_temp >= T_LETHAL, axis=1)
 
         # Consecutive high temperature
-        above_30 = valid_temp >= T_SUBLETHAL
         metrics['max_consecutive_hot'] = self._max_consecutive_true(above_30)
 
         return metrics
 
+    def _stage_temperature_metrics(self, temp: np.ndarray, selected: np.ndarray,
+                                   t_low: float, t_high: float, stage_name: str) -> dict:
+        """
+        Calculate temperature statistics over the steps spent in one stage.
+
+        Parameters:
+            temp: (particle, time) temperature
+            selected: (particle, time) mask of valid steps in the stage
+            t_low, t_high: Optimal range of the stage
+            stage_name: Column suffix ('egg' or 'larva')
+
+        Returns:
+            Dictionary of per-particle arrays (NaN for particles never in the stage)
+        """
+        n_hours = np.sum(selected, axis=1)
+        in_stage = n_hours > 0
+        n_hours = np.maximum(n_hours, 1)
+        stage_temp = np.where(selected, temp, np.nan)
+
+        def fraction(condition):
+            return np.where(in_stage, np.sum(condition & selected, axis=1) / n_hours, np.nan)
+
+        def degree_hours(excess):
+            return np.where(in_stage, np.sum(np.where(selected, np.maximum(0, excess), 0),
+                                             axis=1), np.nan)
+
+        return {
+            f'temp_mean_{stage_name}': np.nanmean(stage_temp, axis=1),
+            f'temp_std_{stage_name}': np.nanstd(stage_temp, axis=1),
+
+            # Optimal and high temperature exposure
+            f'frac_{stage_name}_hours_optimal': fraction((temp >= t_low) & (temp <= t_high)),
+            f'frac_{stage_name}_hours_hot': fraction(temp >= T_SUBLETHAL),
+
+            # Degree-hour deviations
+            f'hot_deg_h_{stage_name}': degree_hours(temp - t_high),
+            f'cold_deg_h_{stage_name}': degree_hours(t_low - temp)
+        }
+
+    def _temperature_metrics_numba(self, temp: np.ndarray, end_idx: np.ndarray,
+                                   stage: np.ndarray = None) -> dict:
+        """Temperature metrics from the fused per-particle kernel (same keys/dtypes)."""
+        n_particles = temp.shape[0]
+        overall = np.empty((n_particles, 4))
+        extremes = np.zeros((n_particles, 3), dtype=np.int64)
+        stage_hours = np.zeros((n_particles, 2), dtype=np.int64)
+        stage_stats = np.zeros((n_particles, 2, 4))
+        stage_counts = np.zeros((n_particles, 2, 3), dtype=np.int64)
+
+        _temperature_metrics_kernel(
+            np.ascontiguousarray(temp),
+            np.ascontiguousarray(stage) if stage is not None else np.empty((0, 0), np.uint8),
+            end_idx.astype(np.int64),
+            np.array([TOPT_LOW_EGG, TOPT_LOW_LARVA]),
+            np.array([TOPT_HIGH_EGG, TOPT_HIGH_LARVA]),
+            overall, extremes, stage_hours, stage_stats, stage_counts
+        )
+
+        # Statistics come back in the temperature precision, as from NumPy
+        overall = overall.astype(temp.dtype)
+        stage_stats = stage_stats.astype(temp.dtype)
+
+        metrics = {
+            'temp_mean': overall[:, 0],
+            'temp_std': overall[:, 1],
+            'temp_min': overall[:, 2],
+            'temp_max': overall[:, 3]
+        }
+
+        if stage is not None:
+            for s, stage_name in enumerate(['egg', 'larva']):
+                in_stage = stage_hours[:, s] > 0
+                n_hours = np.maximum(stage_hours[:, s], 1)
+                metrics.update({
+                    f'temp_mean_{stage_name}': stage_stats[:, s, 0],
+                    f'temp_std_{stage_name}': stage_stats[:, s, 1],
+                    f'frac_{stage_name}_hours_optimal':
+                        np.where(in_stage, stage_counts[:, s, 0] / n_hours, np.nan),
+                    f'frac_{stage_name}_hours_hot':
+                        np.where(in_stage, stage_counts[:, s, 1] / n_hours, np.nan),
+                    f'hot_deg_h_{stage_name}': np.where(in_stage, stage_stats[:, s, 2], np.nan),
+                    f'cold_deg_h_{stage_name}': np.where(in_stage, stage_stats[:, s, 3], np.nan)
+                })
+
+        metrics['hours_above_30'] = extremes[:, 0]
+        metrics['hours_above_33'] = extremes[:, 1]
+        metrics['max_consecutive_hot'] = extremes[:, 2]
+
+        return metrics
+
     def _calculate_development_metrics(self, stage: np.ndarray,
                                       progress: np.ndarray,
-                                      age_h: np.ndarray = None,
-                                      settle_idx: int = None) -> dict:
+                                      valid: np.ndarray,
+                                      final_idx: np.ndarray,
+                                      age_h: np.ndarray = None) -> dict:
         """
-        Calculate development metrics.
+        Calculate development metrics for all particles.
+
+        Parameters:
+            stage: (particle, time) life stage
+            progress: (particle, time) development progress
+            valid: (particle, time) mask of steps before settlement
+            final_idx: Settlement index, or last index if not settled
+            age_h: (particle, time) age in hours
 
         Returns:
-            Dictionary with development statistics
+            Dictionary of per-particle development arrays
         """
         metrics = {}
+        rows = np.arange(stage.shape[0])
 
-        end_idx = settle_idx if settle_idx is not None else len(stage)
-
-        # Egg duration
-        egg_mask = stage[:end_idx] == 0
-        if np.any(egg_mask):
-            metrics['egg_duration_h'] = np.sum(egg_mask)
-        else:
-            metrics['egg_duration_h'] = 0
-
-        # Larval duration
-        larva_mask = stage[:end_idx] == 1
-        if np.any(larva_mask):
-            metrics['larva_duration_h'] = np.sum(larva_mask)
-        else:
-            metrics['larva_duration_h'] = 0
+        # Egg and larval durations
+        metrics['egg_duration_h'] = np.sum(valid & (stage == 0), axis=1)
+        metrics['larva_duration_h'] = np.sum(valid & (stage == 1), axis=1)
 
         # Total pelagic larval duration
         metrics['pld_h'] = metrics['egg_duration_h'] + metrics['larva_duration_h']
 
-        # Development progress at settlement
-        if settle_idx is not None:
-            metrics['progress_at_settlement'] = progress[settle_idx]
-        else:
-            metrics['progress_at_settlement'] = progress[-1]
+        # Development progress at settlement (or at the end)
+        metrics['progress_at_settlement'] = progress[rows, final_idx]
 
         # Age if available
         if age_h is not None:
-            metrics['age_at_settlement_h'] = age_h[settle_idx] if settle_idx else age_h[-1]
+            metrics['age_at_settlement_h'] = age_h[rows, final_idx]
 
         return metrics
 
-    def _max_consecutive_true(self, arr: np.ndarray) -> int:
-        """Find maximum consecutive True values."""
-        if not np.any(arr):
-            return 0
-
-        max_count = 0
-        current_count = 0
-
-        for val in arr:
-            if val:
-                current_count += 1
-                max_count = max(max_count, current_count)
-            else:
-                current_count = 0
-
-        return max_count
+    def _max_consecutive_true(self, mask: np.ndarray) -> np.ndarray:
+        """Find maximum consecutive True values along each row of a 2D mask."""
+        # Running count of True values, minus the count at the latest False
+        count = np.cumsum(mask, axis=1)
+        base = np.maximum.accumulate(np.where(mask, 0, count), axis=1)
+        return (count - base).max(axis=1, initial=0)
 
     def generate_connectivity_matrix(self, particle_df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -337,30 +533,17 @@ class ParticleDataExtractor:
         Returns:
             Connectivity matrix as DataFrame
         """
-        # Filter settled particles
-        settled = particle_df[particle_df['settled']].copy()
-
-        # Create connectivity matrix
         zones = list(MPA_ZONES.keys()) + ['OUTSIDE']
-        matrix = pd.DataFrame(0, index=zones, columns=zones)
+
+        # Unsettled particles carry settle_zone 'UNSETTLED'; keep that column
+        # only when there are any, as before
+        columns = zones + (['UNSETTLED'] if (~particle_df['settled']).any() else [])
 
         # Count connections
-        for _, particle in settled.iterrows():
-            source = particle['release_zone']
-            dest = particle['settle_zone']
-            if source in matrix.index and dest in matrix.columns:
-                matrix.loc[source, dest] += 1
-
-        # Add unsettled column
-        unsettled = particle_df[~particle_df['settled']]
-        for _, particle in unsettled.iterrows():
-            source = particle['release_zone']
-            if source in matrix.index:
-                if 'UNSETTLED' not in matrix.columns:
-                    matrix['UNSETTLED'] = 0
-                matrix.loc[source, 'UNSETTLED'] += 1
-
-        return matrix
+        matrix = pd.crosstab(particle_df['release_zone'], particle_df['settle_zone'])
+        matrix = matrix.reindex(index=zones, columns=columns, fill_value=0)
+
+        return matrix.rename_axis(index=None, columns=None)
 
     def save_results(self, output_dir: Path):
         """
@@ -377,14 +560,25 @@ class ParticleDataExtractor:
             self.particle_df.to_csv(particle_file, index=False)
             print(f"Saved particle data to {particle_file}")
 
+            # Columnar copy for faster downstream loading
+            if HAS_PYARROW:
+                parquet_file = particle_file.with_suffix(".parquet")
+                self.particle_df.to_parquet(parquet_file, index=False)
+                print(f"Saved particle data to {parquet_file}")
+
             # Save connectivity matrix
             conn_matrix = self.generate_connectivity_matrix(self.particle_df)
             conn_file = output_dir / "connectivity_matrix.csv"
             conn_matrix.to_csv(conn_file)
             print(f"Saved connectivity matrix to {conn_file}")
 
-            # Save normalized connectivity matrix
-            conn_norm = conn_matrix.div(conn_matrix.sum(axis=1), axis=0)
+            # Save normalized connectivity matrix (rows without particles stay 0)
+            counts = conn_matrix.to_numpy(dtype=float)
+            row_sums = counts.sum(axis=1, keepdims=True)
+            conn_norm = pd.DataFrame(
+                np.divide(counts, row_sums, out=np.zeros_like(counts), where=row_sums != 0),
+                index=conn_matrix.index, columns=conn_matrix.columns
+            )
             conn_norm_file = output_dir / "connectivity_matrix_normalized.csv"
             conn_norm.to_csv(conn_norm_file)
             print(f"Saved normalized connectivity to {conn_norm_file}")
@@ -417,6 +611,33 @@ class ParticleDataExtractor:
         print(f"Saved summary statistics to {stats_file}")
 
 
+def rechunk_trajectory_file(src: Path, dst: Path, chunk: int = TRAJECTORY_CHUNK):
+    """
+    Rewrite a trajectory file with per-particle chunks.
+
+    OpenDrift writes the output one time step at a time, so reading a single
+    particle's time series touches every chunk. Run this once per file to
+    store whole trajectories contiguously before extraction.
+
+    Parameters:
+        src: Source NetCDF trajectory file
+        dst: Output NetCDF file
+        chunk: Number of particles per chunk
+    """
+    with xr.open_dataset(src) as ds:
+        n_particles = ds.dims['trajectory']
+        n_times = ds.dims['time']
+
+        for var in ds.data_vars.values():
+            if var.dims == ('trajectory', 'time'):
+                var.encoding.pop('contiguous', None)
+                var.encoding['chunksizes'] = (min(chunk, n_particles), n_times)
+
+        ds.to_netcdf(dst)
+
+    print(f"Rechunked {src.name} -> {dst}")
+
+
 def main():
     """Main processing workflow."""
     # Example usage
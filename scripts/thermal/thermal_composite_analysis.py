@@ -18,6 +18,8 @@ FOCUS: EGG STAGE TEMPERATURE ANALYSIS
 - Scientifically justified approach with literature validation
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 import pandas as pd
@@ -26,6 +28,12 @@ from matplotlib.patches import Rectangle
 import matplotlib.gridspec as gridspec
 from scipy import stats
 
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 # ----------------- Configuration -----------------
 YEARS = [2014, 2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022]
 
@@ -37,6 +45,14 @@ RUN_MIN = 6           # Minimum hours for continuity analysis
 BLOCK_LENGTH = 5      # Days for block bootstrap
 N_BOOTSTRAP = 2000
 
+# Per-particle columns used by the composite figure
+THERMAL_COLUMNS = ["release_day", "temp_mean_egg", "temp_mean_larva",
+                   "frac_egg_hours_hot", "frac_larva_hours_hot"]
+
+# Single precision is plenty for the thermal summaries
+THERMAL_DTYPES = {"temp_mean_egg": "float32", "temp_mean_larva": "float32",
+                  "frac_egg_hours_hot": "float32", "frac_larva_hours_hot": "float32"}
+
 # Publication-quality color scheme
 COLOR_COLD = "#3B4CC0"     # Deep blue
 COLOR_WARM = "#B40426"     # Deep red
@@ -70,24 +86,55 @@ class ThermalAnalyzer:
         self.data_dir = data_dir
         self.years = YEARS
 
-    def load_particle_data(self, year: int) -> pd.DataFrame:
-        """Load per-particle summary data for a specific year."""
+    def load_particle_data(self, year: int, columns: list = None) -> pd.DataFrame:
+        """
+        Load per-particle summary data for a specific year.
+
+        The CSV is parsed once and cached as a Parquet file next to it;
+        later loads read the cache (only the requested columns) while it is
+        at least as new as the CSV.
+
+        Parameters:
+            year: Year to load
+            columns: Columns to return (all if None)
+
+        Returns:
+            DataFrame with per-particle data
+        """
         file_path = (self.data_dir / f"output_dir_{year}" /
                     "analysis_outputs_v10" / "per_particle_summary_rel_v10.csv")
 
         if not file_path.exists():
             raise FileNotFoundError(f"Particle data not found: {file_path}")
 
-        df = pd.read_csv(file_path, encoding="utf-8-sig", low_memory=False)
+        parquet_path = file_path.with_suffix(".parquet")
+        if (HAS_PYARROW and parquet_path.exists() and
+                parquet_path.stat().st_mtime >= file_path.stat().st_mtime):
+            if columns is not None:
+                header = pq.read_schema(parquet_path).names
+                columns = [c for c in header if c in columns]
+            return pd.read_parquet(parquet_path, columns=columns)
+
+        df = pd.read_csv(file_path, encoding="utf-8-sig", low_memory=False,
+                         dtype=THERMAL_DTYPES)
 
         # Process release day
         if "release_day" in df.columns:
             df["release_day"] = pd.to_numeric(df["release_day"],
-                                             errors="coerce").astype("Int64")
+                                             errors="coerce").astype("Int32")
         elif "release_date" in df.columns:
             df["release_day"] = pd.to_datetime(df["release_date"],
                                                errors="coerce").dt.dayofyear
 
+        if HAS_PYARROW:
+            try:
+                df.to_parquet(parquet_path, compression="snappy", index=False)
+            except (OSError, TypeError, ValueError) as exc:
+                parquet_path.unlink(missing_ok=True)
+                print(f"Warning: Could not write cache {parquet_path}: {exc}")
+
+        if columns is not None:
+            df = df[[c for c in df.columns if c in columns]]
         return df
 
     def block_bootstrap_mean(self, day_values: np.ndarray,
@@ -104,76 +151,122 @@ class ThermalAnalyzer:
         Returns:
             Tuple of (mean, confidence_interval_low, confidence_interval_high)
         """
-        x = np.asarray(day_values, dtype=float)
-        x = x[np.isfinite(x)]
-        n = x.size
+        m, lo, hi = self.block_bootstrap_mean_batch([day_values], block_len, n_boot)[0]
+        return float(m), float(lo), float(hi)
+
+    def block_bootstrap_mean_batch(self, series: list,
+                                   block_len: int = BLOCK_LENGTH,
+                                   n_boot: int = N_BOOTSTRAP) -> np.ndarray:
+        """
+        Block-bootstrap means and 95% confidence intervals of several series.
+
+        Series with the same number of finite values share one set of
+        resampling indices (the draws block_bootstrap_mean makes for that
+        length), so each row matches a call on that series alone.
+
+        Parameters:
+            series: List of daily time series
+            block_len: Length of blocks for resampling
+            n_boot: Number of bootstrap iterations
+
+        Returns:
+            Array of shape (len(series), 3): mean, CI low, CI high
+        """
+        values = [np.asarray(v, dtype=float) for v in series]
+        values = [x[np.isfinite(x)] for x in values]
+        result = np.full((len(values), 3), np.nan)
+
+        by_length = {}
+        for k, x in enumerate(values):
+            if x.size:
+                by_length.setdefault(x.size, []).append(k)
+
+        for n, members in by_length.items():
+            rng = np.random.default_rng(42)
+
+            # Draw all block starts at once and expand them into circular blocks
+            n_blocks = (n + block_len - 1) // block_len
+            starts = rng.integers(0, n, size=(n_boot, n_blocks))
+            idx = (starts[:, :, None] + np.arange(block_len)) % n
+            idx = idx.reshape(n_boot, -1)[:, :n]
+
+            means = np.stack([values[k] for k in members])[:, idx].mean(axis=2)
+            result[members, 0] = np.nanmean(means, axis=1)
+            result[members, 1:] = np.nanpercentile(means, [2.5, 97.5], axis=1).T
 
-        if n == 0:
-            return np.nan, np.nan, np.nan
+        return result
 
-        rng = np.random.default_rng(42)
-        means = []
+    def day_groups(self, df: pd.DataFrame) -> tuple:
+        """
+        Group release days once for all daily metrics of a year.
+
+        Returns:
+            Tuple of (group code per row, -1 for missing days; sorted day index)
+        """
+        codes, days = pd.factorize(df["release_day"], sort=True)
+        return codes, pd.Index(days, name="release_day")
 
-        for _ in range(n_boot):
-            idx = []
-            while len(idx) < n:
-                start = rng.integers(0, n)
-                blk = [(start + k) % n for k in range(block_len)]
-                idx.extend(blk)
-            idx = np.array(idx[:n], dtype=int)
-            means.append(np.nanmean(x[idx]))
+    def _daily_mean(self, values: pd.Series, groups: tuple) -> pd.Series:
+        """Mean of values per release day, skipping NaN (like groupby().mean())."""
+        codes, days = groups
+        x = values.to_numpy(dtype=float, na_value=np.nan)
+        keep = (codes >= 0) & ~np.isnan(x)
 
-        means = np.asarray(means)
-        m = float(np.nanmean(means))
-        lo, hi = np.nanpercentile(means, [2.5, 97.5])
+        sums = np.bincount(codes[keep], weights=x[keep], minlength=len(days))
+        counts = np.bincount(codes[keep], minlength=len(days))
+        means = np.divide(sums, counts, out=np.full(len(days), np.nan), where=counts > 0)
 
-        return m, float(lo), float(hi)
+        return pd.Series(means, index=days, name=values.name)
 
-    def calculate_hot_degree_days(self, df: pd.DataFrame) -> pd.Series:
+    def calculate_hot_degree_days(self, df: pd.DataFrame,
+                                  groups: tuple = None) -> pd.Series:
         """
         Calculate hot degree-days (temperature excess above optimal).
 
         Hot degree-days = mean(max(0, T - T_opt_high)) per day
+        groups: Result of day_groups(df), to share between metrics
         """
         temp_col = self._find_column(df, "temp_mean_egg", ["temp_mean_larva"])
 
         if temp_col:
-            def calc_hot(temps):
-                return np.clip(temps - TOPT_HIGH, 0, None).mean()
-            return df.groupby("release_day")[temp_col].apply(calc_hot)
+            hot = (df[temp_col] - TOPT_HIGH).clip(lower=0)
+            return self._daily_mean(hot, groups or self.day_groups(df))
 
         return pd.Series(dtype=float)
 
-    def calculate_cold_degree_days(self, df: pd.DataFrame) -> pd.Series:
+    def calculate_cold_degree_days(self, df: pd.DataFrame,
+                                   groups: tuple = None) -> pd.Series:
         """
         Calculate cold degree-days (temperature deficit below optimal).
 
         Cold degree-days = mean(max(0, T_opt_low - T)) per day
+        groups: Result of day_groups(df), to share between metrics
         """
         temp_col = self._find_column(df, "temp_mean_egg", ["temp_mean_larva"])
 
         if temp_col:
-            def calc_cold(temps):
-                return np.clip(TOPT_LOW - temps, 0, None).mean()
-            return df.groupby("release_day")[temp_col].apply(calc_cold)
+            cold = (TOPT_LOW - df[temp_col]).clip(lower=0)
+            return self._daily_mean(cold, groups or self.day_groups(df))
 
         return pd.Series(dtype=float)
 
-    def calculate_heat_exposure(self, df: pd.DataFrame) -> pd.Series:
+    def calculate_heat_exposure(self, df: pd.DataFrame,
+                                groups: tuple = None) -> pd.Series:
         """
         Calculate fraction of time experiencing high temperature (>=30°C).
+
+        groups: Result of day_groups(df), to share between metrics
         """
         col = self._find_column(df, "frac_egg_hours_hot", ["frac_larva_hours_hot"])
 
         if col:
-            return df.groupby("release_day")[col].mean()
+            return self._daily_mean(df[col], groups or self.day_groups(df))
 
         # Fallback calculation
         temp_col = self._find_column(df, "temp_mean_egg", ["temp_mean_larva"])
         if temp_col:
-            def calc_frac(temps):
-                return (temps >= HTHRESH).mean()
-            return df.groupby("release_day")[temp_col].apply(calc_frac)
+            hot = (df[temp_col] >= HTHRESH).astype(float)
+            return self._daily_mean(hot, groups or self.day_groups(df))
 
         return pd.Series(dtype=float)
 
@@ -189,18 +282,26 @@ class ThermalAnalyzer:
         Returns:
             'warm', 'cold', or 'neutral'
         """
-        all_temps = list(egg_temps.values())
-        p25 = np.percentile(all_temps, 25)
-        p75 = np.percentile(all_temps, 75)
+        return self.classify_regimes(egg_temps).get(year, 'neutral')
+
+    def classify_regimes(self, egg_temps: dict) -> dict:
+        """
+        Classify all years at once against the 25th/75th egg-temperature percentiles.
 
-        temp = egg_temps.get(year, np.nan)
+        Parameters:
+            egg_temps: Dictionary of {year: mean_egg_temperature}
 
-        if temp > p75:
-            return 'warm'
-        elif temp < p25:
-            return 'cold'
-        else:
-            return 'neutral'
+        Returns:
+            Dictionary of {year: 'warm', 'cold' or 'neutral'}
+        """
+        temps = np.fromiter(egg_temps.values(), dtype=float, count=len(egg_temps))
+        if temps.size == 0:
+            return {}
+
+        p25, p75 = np.percentile(temps, [25, 75])
+        labels = np.where(temps > p75, 'warm', np.where(temps < p25, 'cold', 'neutral'))
+
+        return dict(zip(egg_temps.keys(), labels.tolist()))
 
     def _find_column(self, df: pd.DataFrame,
                     prefer: str, fallback: list = None) -> str:
@@ -210,6 +311,36 @@ class ThermalAnalyzer:
                 return c
         return None
 
+    def _process_year(self, year: int) -> dict:
+        """
+        Load one year and compute its daily thermal metrics.
+
+        Returns:
+            Dictionary of metric series, or None if the year has no data
+        """
+        try:
+            df = self.load_particle_data(year, columns=THERMAL_COLUMNS)
+        except FileNotFoundError:
+            return None
+
+        # Without release days there is nothing to average per day, so every
+        # metric is empty rather than each one regrouping a missing column
+        if "release_day" not in df.columns:
+            empty = pd.Series(dtype=float)
+            return {'hot_dd': empty, 'cold_dd': empty, 'heat_exp': empty,
+                    'mean_temp': None}
+
+        # One release-day grouping shared by all metrics
+        groups = self.day_groups(df)
+
+        return {
+            'hot_dd': self.calculate_hot_degree_days(df, groups),
+            'cold_dd': self.calculate_cold_degree_days(df, groups),
+            'heat_exp': self.calculate_heat_exposure(df, groups),
+            'mean_temp': self._daily_mean(df["temp_mean_egg"], groups)
+                        if "temp_mean_egg" in df.columns else None
+        }
+
     def generate_composite_figure(self, output_path: Path = None):
         """
         Generate three-panel thermal composite figure.
@@ -218,26 +349,17 @@ class ThermalAnalyzer:
         Panel B: Interannual temperature variation
         Panel C: High-temperature exposure patterns
         """
-        # Load data for all years
-        year_data = {}
-        for year in self.years:
-            try:
-                df = self.load_particle_data(year)
-                year_data[year] = df
-            except FileNotFoundError:
-                print(f"Warning: No data for {year}")
-                continue
+        # Load and reduce each year (file reads release the GIL, so years overlap)
+        max_workers = min(len(self.years), os.cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._process_year, self.years))
 
-        # Calculate metrics for each year
         metrics = {}
-        for year, df in year_data.items():
-            metrics[year] = {
-                'hot_dd': self.calculate_hot_degree_days(df),
-                'cold_dd': self.calculate_cold_degree_days(df),
-                'heat_exp': self.calculate_heat_exposure(df),
-                'mean_temp': df.groupby("release_day")["temp_mean_egg"].mean()
-                            if "temp_mean_egg" in df.columns else None
-            }
+        for year, year_metrics in zip(self.years, results):
+            if year_metrics is None:
+                print(f"Warning: No data for {year}")
+                continue
+            metrics[year] = year_metrics
 
         # Create figure
         fig = plt.figure(figsize=(14, 12))
@@ -274,25 +396,20 @@ class ThermalAnalyzer:
         """Plot hot and cold degree-days comparison."""
         years = sorted(metrics.keys())
 
-        hot_means = []
-        cold_means = []
-
-        for year in years:
-            hot_dd = metrics[year]['hot_dd']
-            cold_dd = metrics[year]['cold_dd']
-
-            hot_mean, _, _ = self.block_bootstrap_mean(hot_dd.values)
-            cold_mean, _, _ = self.block_bootstrap_mean(cold_dd.values)
-
-            hot_means.append(hot_mean)
-            cold_means.append(cold_mean)
+        # Bootstrap every year's hot and cold series in one batch
+        boot = self.block_bootstrap_mean_batch(
+            [metrics[year]['hot_dd'].values for year in years] +
+            [metrics[year]['cold_dd'].values for year in years]
+        )
+        hot_means = boot[:len(years), 0]
+        cold_means = boot[len(years):, 0]
 
         x = np.arange(len(years))
         width = 0.35
 
         ax.bar(x - width/2, hot_means, width, label='Above optimal',
                color=COLOR_WARM, alpha=0.7)
-        ax.bar(x + width/2, [-c for c in cold_means], width,
+        ax.bar(x + width/2, -cold_means, width,
                label='Below optimal', color=COLOR_COLD, alpha=0.7)
 
         ax.set_xlabel('Year')
@@ -324,21 +441,19 @@ class ThermalAnalyzer:
         """Plot high-temperature exposure patterns."""
         years = sorted(metrics.keys())
 
-        exposure_means = []
-        exposure_ci = []
-
-        for year in years:
-            heat_exp = metrics[year]['heat_exp']
-            mean, lo, hi = self.block_bootstrap_mean(heat_exp.values)
-            exposure_means.append(mean * 100)  # Convert to percentage
-            exposure_ci.append((mean - lo) * 100, (hi - mean) * 100)
+        boot = self.block_bootstrap_mean_batch(
+            [metrics[year]['heat_exp'].values for year in years]
+        ) * 100  # Convert to percentage
+        exposure_means = boot[:, 0]
+        exposure_ci = np.column_stack([exposure_means - boot[:, 1],
+                                       boot[:, 2] - exposure_means])
 
         x = np.arange(len(years))
         colors = [COLOR_WARM if m > 10 else COLOR_COLD for m in exposure_means]
 
         ax.bar(x, exposure_means, color=colors, alpha=0.7)
         ax.errorbar(x, exposure_means,
-                   yerr=np.array(exposure_ci).T,
+                   yerr=exposure_ci.T,
                    fmt='none', color='black', capsize=3)
 
         ax.set_xlabel('Year')
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Regression tests for the Benjamini-Hochberg adjustments
+
+A NaN p-value (e.g. from a constant exposure series) must stay NaN
+without turning every other adjusted p-value into NaN.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR / "analysis"))
+sys.path.insert(0, str(SCRIPTS_DIR / "utils"))
+
+from exposure_response_analysis import ExposureResponseAnalyzer
+from statistical_utilities import fdr_correction
+
+
+P_WITH_NAN = [0.01, 0.02, np.nan, 0.04]
+EXPECTED_WITH_NAN = [0.04, 0.04, np.nan, 0.04 * 4 / 3]
+
+
+def test_exposure_response_fdr_keeps_finite_values_with_nan():
+    analyzer = ExposureResponseAnalyzer(Path("."))
+    adjusted = analyzer._fdr_correction(P_WITH_NAN)
+    np.testing.assert_allclose(adjusted, EXPECTED_WITH_NAN)
+
+
+def test_statistical_utilities_fdr_keeps_finite_values_with_nan():
+    adjusted, reject = fdr_correction(P_WITH_NAN)
+    np.testing.assert_allclose(adjusted, EXPECTED_WITH_NAN)
+    np.testing.assert_array_equal(reject, [True, True, False, False])
+
+
+def test_fdr_implementations_agree_on_finite_input():
+    p_values = np.random.default_rng(0).random(200) ** 3
+    analyzer = ExposureResponseAnalyzer(Path("."))
+    np.testing.assert_allclose(analyzer._fdr_correction(p_values),
+                               fdr_correction(p_values)[0])
+
+
+if __name__ == "__main__":
+    test_exposure_response_fdr_keeps_finite_values_with_nan()
+    test_statistical_utilities_fdr_keeps_finite_values_with_nan()
+    test_fdr_implementations_agree_on_finite_input()
+    print("All FDR regression tests passed")